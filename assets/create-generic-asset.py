@@ -53,7 +53,7 @@ def main():
             for item in pset.get('parameters', [])
             if any(match_classification(classification[0], c) for c in item.get('applicationFilters').get('userClass'))
         ]
-        schema = client.get_model_schema(default_model.get('modelId'))
+        schema = client.get_model_schema(default_model.get('modelId'), as_index=True)
         # STEP 5 - collect inputs for new asset
         inputs = {
             'muts': [
@@ -101,7 +101,7 @@ def main():
             class_parameter = next((p for p in class_parameters if p.get('name') == item), None)
             if class_parameter is None:
                 continue
-            param = next((p for p in schema.get('attributes') if p.get('name') == class_parameter.get('name') and p.get('category') == class_parameter.get('category')), None)
+            param = schema.find(class_parameter.get('category'), class_parameter.get('name'))
             if param is None:
                 continue
             inputs['muts'].append([
@@ -29,9 +29,9 @@ def main():
         # STEP 3 - iterate through facility models and collect tagged assets
         for l in facility.get('links'):
             model_id = l.get('modelId')
-            schema = client.get_model_schema(model_id)
+            schema = client.get_model_schema(model_id, as_index=True)
             # STEP 4 - read property definitions for tag properties - they are of type StringList
-            prop_defs = [p for p in schema.get('attributes') if p.get('dataType') == DATA_TYPE_STRING_LIST]
+            prop_defs = schema.get_by_data_type(DATA_TYPE_STRING_LIST)
 
             if len(prop_defs) == 0:
                 continue
@@ -49,7 +49,7 @@ def main():
                 print(f'{name}: {key}')
                 # STEP 5 - iterate through tag properties and print out property name & value
                 for prop_id in props:
-                    prop_def = next((p for p in schema.get('attributes') if p.get('id') == prop_id), None)
+                    prop_def = schema.get(prop_id)
                     if prop_def is None:
                         continue
                     values = asset.get(prop_id)
@@ -0,0 +1,469 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from typing import Any, Callable, Dict, List
+
+from .constants import (
+    COLUMN_FAMILIES_DTPROPERTIES,
+    COLUMN_FAMILIES_REFS,
+    COLUMN_FAMILIES_STANDARD,
+    COLUMN_FAMILIES_SYSTEMS,
+    COLUMN_FAMILIES_XREFS,
+    AccessLevel,
+    Environment
+)
+from .rateLimiter import AdaptiveRateLimiter
+from .retryPolicy import RetryPolicy, RetryStats
+from .tandemClient import TandemClient
+
+class AsyncTandemClient:
+    """ Asyncio wrapper for Tandem Data API """
+
+    def __init__(self,
+                 callback: Callable[..., str],
+                 region: str | None = None,
+                 env: Environment = Environment.PROD,
+                 max_concurrency: int = 8,
+                 adapter_options: Dict[str, Any] | None = None,
+                 retry_policy: RetryPolicy | None = None,
+                 rate_limiter: AdaptiveRateLimiter | None = None,
+                 timeout: float | None = None) -> None:
+        """
+        Creates new instance of AsyncTandemClient.
+
+        Methods have same signature as methods of TandemClient but they are coroutines. Calls are executed
+        on shared connection pool and max_concurrency limits number of calls which run at the same time.
+        """
+
+        self.__client = TandemClient(callback,
+                                     region=region,
+                                     env=env,
+                                     pool_maxsize=max_concurrency,
+                                     pool_block=True,
+                                     adapter_options=adapter_options,
+                                     retry_policy=retry_policy,
+                                     rate_limiter=rate_limiter,
+                                     timeout=timeout)
+        self.__max_concurrency = max_concurrency
+        self.__semaphore = asyncio.Semaphore(max_concurrency)
+        self.__executor: ThreadPoolExecutor | None = None
+
+    async def __aenter__(self) -> "AsyncTandemClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        # close waits for running calls so it is executed outside of event loop (default executor - own executor is closed)
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        """
+        Returns counters of calls and retries.
+        """
+
+        return self.__client.retry_stats
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """
+        Returns policy used to retry failed calls.
+        """
+
+        return self.__client.retry_policy
+
+    def close(self) -> None:
+        """
+        Stops worker threads and closes pooled connections.
+        """
+
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
+        self.__client.close()
+
+    async def add_facility_user(self, facility_id: str, user_email: str, access_level: AccessLevel) -> None:
+        """
+        Adds user to the facility.
+        """
+
+        return await self.__run(self.__client.add_facility_user, facility_id, user_email, access_level)
+
+    async def add_group_user(self, group_id: str, user_email: str, access_level: AccessLevel) -> None:
+        """
+        Adds user to the group.
+        """
+
+        return await self.__run(self.__client.add_group_user, group_id, user_email, access_level)
+
+    async def apply_facility_template(self, facility_id: str, template: Any) -> None:
+        """
+        NON-PUBLIC METHOD: Use carefully.
+
+        Applies template to the facility.
+        """
+
+        return await self.__run(self.__client.apply_facility_template, facility_id, template)
+
+    async def confirm_document_upload(self, facility_id: str, upload_inputs: Any) -> Any:
+        """
+        Completes document upload for given facility.
+        """
+
+        return await self.__run(self.__client.confirm_document_upload, facility_id, upload_inputs)
+
+    async def create_default_model(self, facility_id: str, inputs: Any) -> Any:
+        """
+        Creates default model for the facility.
+        """
+
+        return await self.__run(self.__client.create_default_model, facility_id, inputs)
+
+    async def create_documents(self, facility_id: str, doc_inputs: List[Any]) -> Any:
+        """
+        Adds documents to the facility.
+        """
+
+        return await self.__run(self.__client.create_documents, facility_id, doc_inputs)
+
+    async def create_element(self, model_id: str, inputs: Dict[str, Any]) -> Any:
+        """
+        Adds new element to the model.
+        """
+
+        return await self.__run(self.__client.create_element, model_id, inputs)
+
+    async def create_facility(self, group_id: str, settings: Dict[str, Any]) -> Any:
+        """
+        Creates new facility with given settings.
+        """
+
+        return await self.__run(self.__client.create_facility, group_id, settings)
+
+    async def create_model(self, facility_id: str, model_inputs: Dict[str, Any]) -> Any:
+        """
+        NON-PUBLIC METHOD: Use carefully.
+
+        Creates new model in the facility.
+        """
+
+        return await self.__run(self.__client.create_model, facility_id, model_inputs)
+
+    async def create_stream(self,
+                            model_id: str,
+                            name: str,
+                            uniformat_class_id: str,
+                            category_id: int | None = None,
+                            tandem_category: str | None = None,
+                            classification: str | None = None,
+                            parent_xref: str | None = None,
+                            room_xref: str | None = None,
+                            level_key: str | None = None) -> str:
+        """
+        Creates new stream using provided data.
+        """
+
+        return await self.__run(self.__client.create_stream, model_id, name, uniformat_class_id, category_id, tandem_category, classification, parent_xref, room_xref, level_key)
+
+    async def create_view(self, facility_id: str, view_inputs: Dict[str, Any]) -> Any:
+        """
+        NON-PUBLIC METHOD: Use carefully.
+
+        Adds view to the facility.
+        """
+
+        return await self.__run(self.__client.create_view, facility_id, view_inputs)
+
+    async def delete_elements(self, model_id: str, keys: List[str], desc: str):
+        """
+        Deletes given elements from the model.
+        """
+
+        return await self.__run(self.__client.delete_elements, model_id, keys, desc)
+
+    async def delete_stream_data(self, model_id: str, keys: List[str], substreams: List[str] | None = None, from_date: str | None = None, to_date: str | None = None) -> None:
+        """
+        Deletes data from given streams. It can be used to delete specified substreams or all data from give streams.
+        It's also possible to delete data for given time range (from, to).
+        """
+
+        return await self.__run(self.__client.delete_stream_data, model_id, keys, substreams, from_date, to_date)
+
+    async def get_element(self, model_id: str, key: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD ]) -> Any:
+        """
+        Returns element for given key.
+        """
+
+        return await self.__run(self.__client.get_element, model_id, key, column_families)
+
+    async def get_elements(self, model_id: str, element_ids: List[str] | None = None, column_families: List[str] | None = [ COLUMN_FAMILIES_STANDARD ], columns: List[str] | None = None, include_history: bool = False) -> Any:
+        """
+        Returns list of elements for given model.
+        """
+
+        return await self.__run(self.__client.get_elements, model_id, element_ids, column_families, columns, include_history)
+
+    async def get_facility(self, facility_id: str) -> Any:
+        """
+        Retuns facility for given facility urn.
+        """
+
+        return await self.__run(self.__client.get_facility, facility_id)
+
+    async def get_facility_history(self, facility_id: str, inputs: Any) -> Any:
+        """
+        Retuns history for given facility.
+        """
+
+        return await self.__run(self.__client.get_facility_history, facility_id, inputs)
+
+    async def get_facility_template(self, facility_id: str) -> Any:
+        """
+        Retuns facility teplate for given facility urn.
+        """
+
+        return await self.__run(self.__client.get_facility_template, facility_id)
+
+    async def get_facility_users(self, facility_id: str) -> Dict[str, Any]:
+        """
+        Returns dictionary of facility users.
+        """
+
+        return await self.__run(self.__client.get_facility_users, facility_id)
+
+    async def get_group(self, group_id: str) -> Any:
+        """
+        Returns group details.
+        """
+
+        return await self.__run(self.__client.get_group, group_id)
+
+    async def get_group_facilities(self, group_id: str) -> Any:
+        """
+        Returns facilities for given group.
+        """
+
+        return await self.__run(self.__client.get_group_facilities, group_id)
+
+    async def get_groups(self) -> Any:
+        """
+        Returns list of groups.
+        """
+
+        return await self.__run(self.__client.get_groups)
+
+    async def get_levels(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD ], columns: List[str] | None = None) -> Any:
+        """
+        Returns level elements from given model. If columns are provided then only these columns are returned.
+        """
+
+        return await self.__run(self.__client.get_levels, model_id, column_families, columns)
+
+    async def get_model(self, model_id: str) -> Any:
+        """
+        Returns model for given model URN.
+        """
+
+        return await self.__run(self.__client.get_model, model_id)
+
+    async def get_model_attributes(self, model_id: str) -> Any:
+        """
+        Returns model attributes for given model URN.
+        """
+
+        return await self.__run(self.__client.get_model_attributes, model_id)
+
+    async def get_model_history(self,
+                                model_id: str,
+                                min: int | None = None,
+                                max: int | None = None,
+                                timestamps: List[int] | None = None,
+                                include_changes: bool = False,
+                                use_full_keys: bool = False):
+        """
+        Returns model changes.
+        """
+
+        return await self.__run(self.__client.get_model_history, model_id, min, max, timestamps, include_changes, use_full_keys)
+
+    async def get_model_history_between_dates(self, model_id: str, from_date: int, to_date: int, include_changes: bool = True, use_full_keys: bool = True):
+        """
+        Returns model changes between two dates.
+        """
+
+        return await self.__run(self.__client.get_model_history_between_dates, model_id, from_date, to_date, include_changes, use_full_keys)
+
+    async def get_model_props(self, model_id: str) -> Any:
+        """
+        Returns model properties.
+        """
+
+        return await self.__run(self.__client.get_model_props, model_id)
+
+    async def get_model_schema(self, model_id: str, as_index: bool = False) -> Any:
+        """
+        Returns schema for given model URN. If as_index is True then schema is returned as SchemaIndex.
+        """
+
+        return await self.__run(self.__client.get_model_schema, model_id, as_index)
+
+    async def get_rooms(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD ], columns: List[str] | None = None) -> Any:
+        """
+        Returns room elements from given model. If columns are provided then only these columns are returned.
+        """
+
+        return await self.__run(self.__client.get_rooms, model_id, column_families, columns)
+
+    async def get_stream_config(self, model_id: str, stream_key: str) -> Any:
+        """
+        Returns stream configuration for given stream key.
+        """
+
+        return await self.__run(self.__client.get_stream_config, model_id, stream_key)
+
+    async def get_stream_configs(self, model_id: str) -> Any:
+        """
+        Returns all stream configurations for given model.
+        """
+
+        return await self.__run(self.__client.get_stream_configs, model_id)
+
+    async def get_stream_data(self, model_id: str, key: str, from_date: int | None = None, to_date: int | None = None, as_frame: bool = False) -> Any:
+        """
+        Returns data for given stream. It can be used to get data for given time range (from, to).
+        If as_frame is True then data is returned as TimeseriesFrame.
+        """
+
+        return await self.__run(self.__client.get_stream_data, model_id, key, from_date, to_date, as_frame)
+
+    async def get_stream_last_reading(self, model_id: str, keys: List[str]) -> Any:
+        """
+        Returns last stream readings.
+        """
+
+        return await self.__run(self.__client.get_stream_last_reading, model_id, keys)
+
+    async def get_stream_secrets(self, model_id: str, keys: List[str]) -> Any:
+        """
+        Returns secrets for streams.
+        """
+
+        return await self.__run(self.__client.get_stream_secrets, model_id, keys)
+
+    async def get_streams(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_REFS, COLUMN_FAMILIES_XREFS ], columns: List[str] | None = None) -> Any:
+        """
+        Returns stream elements from given model. If columns are provided then only these columns are returned.
+        """
+
+        return await self.__run(self.__client.get_streams, model_id, column_families, columns)
+
+    async def get_systems(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_REFS, COLUMN_FAMILIES_SYSTEMS ], columns: List[str] | None = None) -> Any:
+        """
+        Returns system elements from given model. If columns are provided then only these columns are returned.
+        """
+
+        return await self.__run(self.__client.get_systems, model_id, column_families, columns)
+
+    async def get_tagged_assets(self, model_id: str,
+                                column_families: List[str] = [ COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_DTPROPERTIES, COLUMN_FAMILIES_REFS ],
+                                include_history: bool = False,
+                                columns: List[str] | None = None) -> Any:
+        """
+        Returns list of tagged assets from given model. If columns are provided then only these columns are returned.
+        """
+
+        return await self.__run(self.__client.get_tagged_assets, model_id, column_families, include_history, columns)
+
+    async def get_tickets(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_REFS,COLUMN_FAMILIES_XREFS ], columns: List[str] | None = None) -> Any:
+        """
+        Returns ticket elements from given model. If columns are provided then only these columns are returned.
+        """
+
+        return await self.__run(self.__client.get_tickets, model_id, column_families, columns)
+
+    async def get_views(self, facility_id: str) -> Any:
+        """
+        Returns list of views for given facility.
+        """
+
+        return await self.__run(self.__client.get_views, facility_id)
+
+    async def mutate_elements(self, model_id: str, keys: List[str], mutations, description: str, correlation_id: str | None = None, additional_params: dict | None= None) -> Any:
+        """
+        Modifies given elements.
+        """
+
+        return await self.__run(self.__client.mutate_elements, model_id, keys, mutations, description, correlation_id, additional_params)
+
+    async def query_stream_data(self, model_id: str, keys: list[str], attrs: list[str] | None = None, from_date: int | None = None, to_date: int | None = None, use_delta: bool = False, as_frame: bool = False, retry_policy: RetryPolicy | None = None, timeout: float | None = None) -> Any:
+        """
+        Returns data for given stream and optionally for given attributes. It can be used to get data for given time range (from, to).
+        If as_frame is True then data is returned as TimeseriesFrame. retry_policy and timeout override settings of the client for this call.
+        """
+
+        return await self.__run(self.__client.query_stream_data, model_id, keys, attrs, from_date, to_date, use_delta, as_frame, retry_policy, timeout)
+
+    async def reset_stream_secrets(self, model_id, stream_ids: List[str], hard_reset: bool = False) -> Any:
+        """
+        Resets secrets for given streams.
+        """
+
+        return await self.__run(self.__client.reset_stream_secrets, model_id, stream_ids, hard_reset)
+
+    async def scan_model_partitioned(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD ], include_history: bool = False) -> Dict[str, List[Any]]:
+        """
+        Scans model once and returns its elements grouped by type (levels, rooms, streams, systems, tickets
+        and other elements). Tagged assets are also returned in separate group.
+        """
+
+        return await self.__run(self.__client.scan_model_partitioned, model_id, column_families, include_history)
+
+    async def save_document_content(self, url: str, file_path: str) -> None:
+        """
+        Downloads document to local file.
+        """
+
+        return await self.__run(self.__client.save_document_content, url, file_path)
+
+    async def save_stream_config(self, model_id: str, stream_key: str, inputs: Any) -> Any:
+        """
+        Saves configuration for given stream.
+        """
+
+        return await self.__run(self.__client.save_stream_config, model_id, stream_key, inputs)
+
+    async def send_stream_data(self, model_id: str, stream_values: List[Any]) -> None:
+        """
+        Sends stream data.
+        """
+
+        return await self.__run(self.__client.send_stream_data, model_id, stream_values)
+
+    async def upload_document(self, facility_id: str, file_inputs: Any) -> Any:
+        """
+        Starts document upload for given facility.
+        """
+
+        return await self.__run(self.__client.upload_document, facility_id, file_inputs)
+
+    async def update_stream_configs(self, model_id: str, inputs: Any) -> Any:
+        """
+        Updates configuration for provided streams.
+        """
+
+        return await self.__run(self.__client.update_stream_configs, model_id, inputs)
+
+    async def update_system_connections(self, model_id: str, system_id: str) -> None:
+        """
+        NON-PUBLIC METHOD: Use carefully.
+
+        Runs task to update system connections for given system.
+        """
+
+        return await self.__run(self.__client.update_system_connections, model_id, system_id)
+
+    async def __run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.__max_concurrency, thread_name_prefix='tandem')
+        async with self.__semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.__executor, functools.partial(func, *args))
\ No newline at end of file
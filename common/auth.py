@@ -1,4 +1,6 @@
-from typing import List
+import threading
+import time
+from typing import Any, Dict, List, Tuple
 import requests
 
 from .constants import Environment
@@ -6,6 +8,12 @@ from .constants import Environment
 def create_token(client_id: str, client_secret: str, scope: List[str], env: Environment = Environment.PROD) -> str:
     """ Creates 2-legged authorization token. """
 
+    data = request_token(client_id, client_secret, scope, env)
+    return data.get('access_token')
+
+def request_token(client_id: str, client_secret: str, scope: List[str], env: Environment = Environment.PROD) -> Dict[str, Any]:
+    """ Requests 2-legged authorization token. Returns token response including expires_in (seconds). """
+
     base_url = {
         'prod': 'https://developer.api.autodesk.com',
         'stg': 'https://developer-stg.api.autodesk.com'
@@ -18,5 +26,74 @@ def create_token(client_id: str, client_secret: str, scope: List[str], env: Envi
     response = requests.post(url, params=options, auth=(client_id, client_secret))
     if not response.ok:
         raise Exception(f'Error while obtaining token: {response.status_code} - {response.text}')
-    data = response.json()
-    return data.get('access_token')
\ No newline at end of file
+    return response.json()
+
+class TokenProvider:
+    """
+    Provides 2-legged token. Tokens are cached by client id, scope and environment and shared by all instances.
+    The token is refreshed when it's about to expire (refresh_margin seconds before expiration). For tokens with
+    short lifetime the margin is limited to half of the lifetime so cached token is still used.
+    Instance can be passed directly as callback to TandemClient.
+    """
+
+    # token, expiration time and lifetime (seconds)
+    __cache: Dict[Tuple[str, Tuple[str, ...], str], Tuple[str, float, float]] = {}
+    __locks: Dict[Tuple[str, Tuple[str, ...], str], threading.Lock] = {}
+    __cache_lock = threading.Lock()
+
+    def __init__(self, client_id: str, client_secret: str, scope: List[str], env: Environment = Environment.PROD, refresh_margin: int = 300) -> None:
+        """
+        Creates new instance of TokenProvider.
+        """
+
+        self.__client_id = client_id
+        self.__client_secret = client_secret
+        self.__scope = sorted(set(scope))
+        self.__env = env
+        self.__refresh_margin = refresh_margin
+        self.__key = (client_id, tuple(self.__scope), str(env))
+
+    def __call__(self) -> str:
+        return self.get_token()
+
+    def get_token(self) -> str:
+        """
+        Returns cached token or requests new one if cached token is missing or about to expire.
+        """
+
+        token = self.__get_cached()
+        if token is not None:
+            return token
+        with TokenProvider.__cache_lock:
+            lock = TokenProvider.__locks.setdefault(self.__key, threading.Lock())
+        # only one thread refreshes the token, others wait and then use refreshed token
+        with lock:
+            token = self.__get_cached()
+            if token is not None:
+                return token
+            data = request_token(self.__client_id, self.__client_secret, self.__scope, self.__env)
+            token = data.get('access_token')
+            expires_in = data.get('expires_in')
+            if expires_in is None:
+                raise Exception('Error while obtaining token: expires_in is missing in response')
+            with TokenProvider.__cache_lock:
+                TokenProvider.__cache[self.__key] = (token, time.monotonic() + expires_in, expires_in)
+            return token
+
+    def invalidate(self) -> None:
+        """
+        Removes token from the cache. Next call requests new token.
+        """
+
+        with TokenProvider.__cache_lock:
+            TokenProvider.__cache.pop(self.__key, None)
+
+    def __get_cached(self) -> str | None:
+        with TokenProvider.__cache_lock:
+            item = TokenProvider.__cache.get(self.__key)
+        if item is None:
+            return None
+        token, expires_at, expires_in = item
+        if time.monotonic() >= expires_at - min(self.__refresh_margin, expires_in / 2):
+            return None
+        return token
@@ -177,6 +177,15 @@ TC_ROOMS = 'L.Rm'
 TC_SENSORS = 'Q.Se'
 TC_TICKET = 'I.Ti'
 
+# element partition related constants
+EP_ASSETS = 'assets'
+EP_ELEMENTS = 'elements'
+EP_LEVELS = 'levels'
+EP_ROOMS = 'rooms'
+EP_STREAMS = 'streams'
+EP_SYSTEMS = 'systems'
+EP_TICKETS = 'tickets'
+
 # history related constants
 HC_CLIENT_ID = 'c'
 HC_CORRELATION = 'i'
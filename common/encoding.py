@@ -1,10 +1,17 @@
 import base64
+from collections import OrderedDict
+import copy
 import json
 import struct
+import threading
 import uuid
-from typing import Any, List, Tuple
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+import weakref
+
+import numpy as np
 
 from .constants import (
+    ELEMENT_FLAGS_ALL_LOGICAL_MASK,
     ELEMENT_FLAGS_SIZE,
     ELEMENT_ID_SIZE,
     ELEMENT_ID_WITH_FLAGS_SIZE,
@@ -14,6 +21,456 @@ from .constants import (
     SYSTEM_ID_SIZE
 )
 
+XREF_SIZE = MODEL_ID_SIZE + ELEMENT_ID_WITH_FLAGS_SIZE
+# arrays with fewer keys are encoded key by key - numpy overhead is higher than gain for short arrays
+VECTORIZED_MIN_KEYS = 8
+
+class ElementKey:
+    """
+    Element key stored as raw bytes. Short, full and xref forms are created on demand and cached.
+    Keys are equal when they refer to same element - key flags are not compared.
+    Use from_short, from_full or from_xref to get interned instance.
+    """
+
+    __slots__ = ('__id', '__flags', '__hash', '__short', '__full', '__xrefs', '__weakref__')
+    __interned: "weakref.WeakValueDictionary[bytes, ElementKey]" = weakref.WeakValueDictionary()
+
+    def __init__(self, id: bytes, flags: int = KEY_FLAGS_PHYSICAL) -> None:
+        """
+        Creates new instance of ElementKey. id is 20 bytes of element id or 24 bytes of full key (flags + id).
+        """
+
+        if len(id) == ELEMENT_ID_WITH_FLAGS_SIZE:
+            flags = struct.unpack_from('>I', id, 0)[0]
+            id = id[ELEMENT_FLAGS_SIZE:]
+        if len(id) != ELEMENT_ID_SIZE:
+            raise ValueError(f'Invalid key length: {len(id)}')
+        self.__id = bytes(id)
+        self.__flags = flags
+        self.__hash = hash(self.__id)
+        self.__short: str | None = None
+        self.__full: str | None = None
+        self.__xrefs: Dict[str, str] | None = None
+
+    @classmethod
+    def from_full(cls, full_key: str) -> "ElementKey":
+        """
+        Returns key for given full key.
+        """
+
+        return cls.intern(cls(ElementKey.__decode(full_key)))
+
+    @classmethod
+    def from_short(cls, short_key: str, is_logical: bool = False) -> "ElementKey":
+        """
+        Returns key for given short key. is_logical is used to create full key.
+        """
+
+        return cls.intern(cls(ElementKey.__decode(short_key), KEY_FLAGS_LOGICAL if is_logical else KEY_FLAGS_PHYSICAL))
+
+    @classmethod
+    def from_xref(cls, xref_key: str) -> Tuple[str, "ElementKey"]:
+        """
+        Returns model id and key for given xref key.
+        """
+
+        buff = ElementKey.__decode(xref_key)
+        model_id = ElementKey.__encode(buff[:MODEL_ID_SIZE])
+        return model_id, cls.intern(cls(buff[MODEL_ID_SIZE:]))
+
+    @classmethod
+    def intern(cls, key: "ElementKey") -> "ElementKey":
+        """
+        Returns shared instance of given key. Instances are kept while they are referenced.
+        """
+
+        return ElementKey.__interned.setdefault(struct.pack('>I', key.flags) + key.id, key)
+
+    @property
+    def flags(self) -> int:
+        return self.__flags
+
+    @property
+    def full(self) -> str:
+        if self.__full is None:
+            self.__full = ElementKey.__encode(struct.pack('>I', self.__flags) + self.__id)
+        return self.__full
+
+    @property
+    def id(self) -> bytes:
+        return self.__id
+
+    @property
+    def is_logical(self) -> bool:
+        return self.__flags == KEY_FLAGS_LOGICAL
+
+    @property
+    def short(self) -> str:
+        if self.__short is None:
+            self.__short = ElementKey.__encode(self.__id)
+        return self.__short
+
+    def xref(self, model_id: str) -> str:
+        """
+        Returns xref key of the element for given model.
+        """
+
+        if self.__xrefs is None:
+            self.__xrefs = {}
+        result = self.__xrefs.get(model_id)
+        if result is None:
+            model_buff = ElementKey.__decode(model_id.replace('urn:adsk.dtm:', ''))
+            result = ElementKey.__encode(model_buff + struct.pack('>I', self.__flags) + self.__id)
+            self.__xrefs[model_id] = result
+        return result
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ElementKey):
+            return NotImplemented
+        return self.__id == other.__id
+
+    def __hash__(self) -> int:
+        return self.__hash
+
+    def __repr__(self) -> str:
+        return f'ElementKey({self.short!r})'
+
+    def __str__(self) -> str:
+        return self.short
+
+    @staticmethod
+    def __decode(text: str) -> bytes:
+        return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+    @staticmethod
+    def __encode(buff: bytes) -> str:
+        return base64.urlsafe_b64encode(buff).decode('ascii').rstrip('=')
+
+class FrozenDict(dict):
+    """
+    Read-only dictionary. Use copy() to get mutable copy. Copies and pickled values are plain dictionaries.
+    """
+
+    def __readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError('FrozenDict is read-only')
+
+    __setitem__ = __readonly
+    __delitem__ = __readonly
+    __ior__ = __readonly
+    clear = __readonly
+    pop = __readonly
+    popitem = __readonly
+    setdefault = __readonly
+    update = __readonly
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self.items()))
+
+    def __copy__(self) -> Dict[Any, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[Any, Any]:
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self) -> Any:
+        return (dict, (dict(self),))
+
+class FrozenList(list):
+    """
+    Read-only list. Use copy() to get mutable copy. Copies and pickled values are plain lists.
+    """
+
+    def __readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError('FrozenList is read-only')
+
+    __setitem__ = __readonly
+    __delitem__ = __readonly
+    __iadd__ = __readonly
+    __imul__ = __readonly
+    append = __readonly
+    clear = __readonly
+    extend = __readonly
+    insert = __readonly
+    pop = __readonly
+    remove = __readonly
+    reverse = __readonly
+    sort = __readonly
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __copy__(self) -> List[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> List[Any]:
+        return copy.deepcopy(list(self), memo)
+
+    def __reduce__(self) -> Any:
+        return (list, (list(self),))
+
+class SettingsCodecCache:
+    """
+    Bounded LRU cache for decode_text_to_object and encode_stream_settings. Decoded objects are returned
+    as read-only (FrozenDict, FrozenList) so cached values can't be modified by callers. Cache is limited by
+    number of entries and by total size of cached texts.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_size: int = 16 * 1024 * 1024) -> None:
+        self.__max_entries = max_entries
+        self.__max_size = max_size
+        self.__decoded: OrderedDict[str, Tuple[Any, int]] = OrderedDict()
+        self.__encoded: OrderedDict[str, Tuple[str, int]] = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self) -> None:
+        """
+        Removes all entries and resets statistics.
+        """
+
+        with self.__lock:
+            self.__decoded.clear()
+            self.__encoded.clear()
+            self.__size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def decode(self, text: str) -> Any:
+        """
+        Returns read-only result of decode_text_to_object for given text.
+        """
+
+        with self.__lock:
+            item = self.__decoded.get(text)
+            if item is not None:
+                self.__decoded.move_to_end(text)
+                self.hits += 1
+                return item[0]
+            self.misses += 1
+        result = SettingsCodecCache.__freeze(decode_text_to_object(text))
+        with self.__lock:
+            self.__add(self.__decoded, text, result, len(text))
+        return result
+
+    def encode(self, settings_obj: Any) -> str:
+        """
+        Returns result of encode_stream_settings for given object.
+        """
+
+        key = json.dumps(settings_obj, separators=(',', ':'))
+        with self.__lock:
+            item = self.__encoded.get(key)
+            if item is not None:
+                self.__encoded.move_to_end(key)
+                self.hits += 1
+                return item[0]
+            self.misses += 1
+        result = encode_stream_settings(settings_obj)
+        with self.__lock:
+            self.__add(self.__encoded, key, result, len(key) + len(result))
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns cache statistics.
+        """
+
+        with self.__lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self.__decoded) + len(self.__encoded),
+                'size': self.__size
+            }
+
+    def __add(self, entries: OrderedDict, key: str, value: Any, size: int) -> None:
+        if size > self.__max_size:
+            return
+        if key in entries:
+            return
+        entries[key] = (value, size)
+        self.__size += size
+        while (len(self.__decoded) + len(self.__encoded) > self.__max_entries) or (self.__size > self.__max_size):
+            # evict least recently used entry from larger of two maps
+            source = self.__decoded if len(self.__decoded) >= len(self.__encoded) else self.__encoded
+            _, (_, evicted_size) = source.popitem(last=False)
+            self.__size -= evicted_size
+            self.evictions += 1
+
+    @staticmethod
+    def __freeze(value: Any) -> Any:
+        if isinstance(value, dict):
+            return FrozenDict((k, SettingsCodecCache.__freeze(v)) for k, v in value.items())
+        if isinstance(value, list):
+            return FrozenList(SettingsCodecCache.__freeze(v) for v in value)
+        return value
+
+settings_cache = SettingsCodecCache()
+
+class KeyArrayView:
+    """
+    Lazy view of packed array of local references (i.e. l:r). Data is decoded once and keys are encoded
+    only when they are accessed. If use_full_keys is set to True then full keys are returned.
+    If is_logical is set to True then logical keys are returned.
+    """
+
+    __slots__ = ('__data', '__count', '__flags')
+
+    def __init__(self, text: str | None, use_full_keys: bool = False, is_logical: bool = False) -> None:
+        buff = b''
+        if text:
+            buff = base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+        self.__count = len(buff) // ELEMENT_ID_SIZE
+        self.__data = memoryview(buff)[:self.__count * ELEMENT_ID_SIZE]
+        self.__flags: bytes | None = None
+        if use_full_keys:
+            self.__flags = struct.pack('>I', KEY_FLAGS_LOGICAL if is_logical else KEY_FLAGS_PHYSICAL)
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, ElementKey):
+            id = key.id
+        elif isinstance(key, str):
+            id = base64.urlsafe_b64decode(key + '=' * (-len(key) % 4))[-ELEMENT_ID_SIZE:]
+        else:
+            return False
+        data = self.__data.obj
+        pos = data.find(id, 0, len(self.__data))
+        while pos != -1:
+            if pos % ELEMENT_ID_SIZE == 0:
+                return True
+            pos = data.find(id, pos + 1, len(self.__data))
+        return False
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self.__count
+        if index < 0 or index >= self.__count:
+            raise IndexError('key index out of range')
+        item = self.__data[index * ELEMENT_ID_SIZE:(index + 1) * ELEMENT_ID_SIZE]
+        if self.__flags is not None:
+            item = self.__flags + item
+        return base64.urlsafe_b64encode(item).decode('ascii').rstrip('=')
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self.__count):
+            yield self[i]
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def to_list(self) -> List[str]:
+        """
+        Returns all keys. Keys are encoded at once (unless there are only few keys).
+        """
+
+        if self.__count < VECTORIZED_MIN_KEYS:
+            return list(self)
+        rows = np.frombuffer(self.__data, dtype=np.uint8).reshape(self.__count, ELEMENT_ID_SIZE)
+        if self.__flags is not None:
+            full_keys = np.empty((self.__count, ELEMENT_ID_WITH_FLAGS_SIZE), dtype=np.uint8)
+            full_keys[:, :ELEMENT_FLAGS_SIZE] = np.frombuffer(self.__flags, dtype=np.uint8)
+            full_keys[:, ELEMENT_FLAGS_SIZE:] = rows
+            rows = full_keys
+        return encode_keys_from_array(rows)
+
+class XrefKeyArrayView:
+    """
+    Lazy view of packed array of cross references (i.e. x:r, x:p). Data is decoded once and items (model id
+    and full element key) are encoded only when they are accessed.
+    """
+
+    __slots__ = ('__data', '__count')
+
+    def __init__(self, text: str | None) -> None:
+        buff = b''
+        if text:
+            buff = base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+        self.__count = len(buff) // XREF_SIZE
+        self.__data = memoryview(buff)[:self.__count * XREF_SIZE]
+
+    def __contains__(self, key: object) -> bool:
+        """
+        Checks if view contains given xref key, (model id, element key) tuple or element key (any model).
+        """
+
+        offset = 0
+        if isinstance(key, ElementKey):
+            value = key.id
+            offset = MODEL_ID_SIZE + ELEMENT_FLAGS_SIZE
+        elif isinstance(key, tuple):
+            model_id, element_key = key
+            value = base64.urlsafe_b64decode(to_xref_key(model_id, element_key) + '==')
+        elif isinstance(key, str):
+            value = base64.urlsafe_b64decode(key + '=' * (-len(key) % 4))
+        else:
+            return False
+        data = self.__data.obj
+        pos = data.find(value, offset, len(self.__data))
+        while pos != -1:
+            if (pos - offset) % XREF_SIZE == 0:
+                return True
+            pos = data.find(value, pos + 1, len(self.__data))
+        return False
+
+    def __getitem__(self, index: int) -> Tuple[str, str]:
+        if index < 0:
+            index += self.__count
+        if index < 0 or index >= self.__count:
+            raise IndexError('key index out of range')
+        offset = index * XREF_SIZE
+        model_id = base64.urlsafe_b64encode(self.__data[offset:offset + MODEL_ID_SIZE]).decode('ascii').rstrip('=')
+        element_key = base64.urlsafe_b64encode(self.__data[offset + MODEL_ID_SIZE:offset + XREF_SIZE]).decode('ascii').rstrip('=')
+        return model_id, element_key
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for i in range(self.__count):
+            yield self[i]
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def to_lists(self) -> Tuple[List[str], List[str]]:
+        """
+        Returns model ids and element keys. Items are encoded at once (unless there are only few items).
+        """
+
+        if self.__count < VECTORIZED_MIN_KEYS:
+            items = list(self)
+            return [model_id for model_id, _ in items], [element_key for _, element_key in items]
+        rows = np.frombuffer(self.__data, dtype=np.uint8).reshape(self.__count, XREF_SIZE)
+        return encode_keys_from_array(rows[:, :MODEL_ID_SIZE]), encode_keys_from_array(rows[:, MODEL_ID_SIZE:])
+
+    def to_list(self) -> List[Tuple[str, str]]:
+        """
+        Returns list of model id and element key tuples. Items are encoded at once.
+        """
+
+        model_ids, element_keys = self.to_lists()
+        return list(zip(model_ids, element_keys))
+
+def decode_keys_to_array(keys: Sequence[str], size: int) -> np.ndarray:
+    """
+    Decodes list of keys of same type to matrix of bytes (one row per key). size is
+    number of bytes of single key (i.e. 20 for short key, 24 for full key).
+    """
+
+    # keys are joined to single string and decoded at once. Each key is padded with 'A' (zero bits)
+    # to multiple of 4 characters so it starts at position of full base64 group.
+    key_len = (size * 4 + 2) // 3
+    padding = 'A' * (-key_len % 4)
+    lengths = set(map(len, keys))
+    if lengths != { key_len }:
+        raise ValueError(f'Expected keys with length {key_len}, got {sorted(lengths)}')
+    text = padding.join(keys) + padding
+    buff = base64.urlsafe_b64decode(text)
+    rows = np.frombuffer(buff, dtype=np.uint8).reshape(len(keys), -1)
+    return rows[:, :size]
+
 def decode_text_to_object(text: str)-> Any:
     """
     Decodes base64 encoded text to object.
@@ -25,6 +482,23 @@ def decode_text_to_object(text: str)-> Any:
 
     return result
 
+def encode_keys_from_array(rows: np.ndarray) -> List[str]:
+    """
+    Encodes matrix of bytes (one row per key) to list of keys.
+    """
+
+    # rows are padded with zeros to multiple of 3 bytes so each row is encoded to full base64 groups
+    count, size = rows.shape
+    padded_size = size + (-size % 3)
+    if padded_size != size:
+        padded = np.zeros((count, padded_size), dtype=np.uint8)
+        padded[:, :size] = rows
+        rows = padded
+    text = base64.urlsafe_b64encode(np.ascontiguousarray(rows).tobytes()).decode('ascii')
+    stride = padded_size * 4 // 3
+    key_len = (size * 4 + 2) // 3
+    return [text[i:i + key_len] for i in range(0, len(text), stride)]
+
 def encode_stream_settings(settings_obj: Any)-> str:
     """
     Encodes stream settings to base64 string.
@@ -36,6 +510,13 @@ def encode_stream_settings(settings_obj: Any)-> str:
 
     return txt
 
+def decode_text_to_object_cached(text: str) -> Any:
+    """
+    Decodes base64 encoded text to read-only object. Results are cached in settings_cache.
+    """
+
+    return settings_cache.decode(text)
+
 def decode_urn(text: str) -> str:
     """
     Decodes urn from text.
@@ -45,6 +526,13 @@ def decode_urn(text: str) -> str:
     buff = base64.b64decode(txt)
     return buff.decode('utf-8')
 
+def encode_stream_settings_cached(settings_obj: Any) -> str:
+    """
+    Encodes stream settings to base64 string. Results are cached in settings_cache.
+    """
+
+    return settings_cache.encode(settings_obj)
+
 def decode_xref_key(key: str) -> Tuple[str, str]:
     """ Decodes xref key to model id and element key."""
 
@@ -61,25 +549,18 @@ def decode_xref_key(key: str) -> Tuple[str, str]:
 def decode_xref_key_array(key: str) -> Tuple[List[str], List[str]]:
     """ Decodes array of xref keys to model ids and element keys."""
 
-    model_ids = []
-    element_keys = []
+    return XrefKeyArrayView(key).to_lists()
 
-    txt = __b64_prepare(key)
-    buff = base64.b64decode(txt)
-    model_buff = bytearray(MODEL_ID_SIZE)
-    offset = 0
-    while offset < len(buff):
-        size = len(buff) - offset
-        if size < MODEL_ID_SIZE + ELEMENT_ID_WITH_FLAGS_SIZE:
-            break
-        model_buff[0:] = buff[offset:offset + MODEL_ID_SIZE]
-        model_id = __make_web_safe(base64.b64encode(model_buff).decode('utf-8'))
-        key_buff = bytearray(MODEL_ID_SIZE)
-        key_buff[0:] = buff[offset + MODEL_ID_SIZE:offset + MODEL_ID_SIZE + ELEMENT_ID_WITH_FLAGS_SIZE]
-        element_key = __make_web_safe(base64.b64encode(key_buff).decode('utf-8'))
-        model_ids.append(model_id)
-        element_keys.append(element_key)
-        offset += MODEL_ID_SIZE + ELEMENT_ID_WITH_FLAGS_SIZE
+def decode_xref_keys(keys: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """
+    Decodes list of xref keys to model ids and element keys. All keys are decoded at once.
+    """
+
+    if len(keys) == 0:
+        return [], []
+    rows = decode_keys_to_array(keys, MODEL_ID_SIZE + ELEMENT_ID_WITH_FLAGS_SIZE)
+    model_ids = encode_keys_from_array(rows[:, :MODEL_ID_SIZE])
+    element_keys = encode_keys_from_array(rows[:, MODEL_ID_SIZE:])
     return model_ids, element_keys
 
 def from_element_GUID(guid: str) -> str:
@@ -97,48 +578,12 @@ def from_short_key_array(text: str, use_full_keys: bool = False, is_logical: boo
     returned.
     """
 
-    text = __b64_prepare(text)
-    bin_data = base64.b64decode(text)
-    buff = bytearray(ELEMENT_ID_SIZE)
-    if use_full_keys:
-        buff = bytearray(ELEMENT_ID_WITH_FLAGS_SIZE)
-    result = []
-    offset = 0
-    while offset < len(bin_data):
-        size = len(bin_data) - offset
-        if size < ELEMENT_ID_SIZE:
-            break
-        if use_full_keys:
-            flags_value = KEY_FLAGS_LOGICAL if is_logical else KEY_FLAGS_PHYSICAL
-            struct.pack_into('>I', buff, 0, flags_value)
-            buff[ELEMENT_FLAGS_SIZE:] = bin_data[offset:offset + ELEMENT_ID_SIZE]
-        else:
-            buff[0:] = bin_data[offset:offset + ELEMENT_ID_SIZE]
-        element_key = __make_web_safe(base64.b64encode(buff).decode('utf-8'))
-        result.append(element_key)
-        offset += ELEMENT_ID_SIZE
-    return result
+    return KeyArrayView(text, use_full_keys, is_logical).to_list()
 
 def from_xref_key_array(text: str) -> List[Tuple[str, str]]:
     """ Decodes text (xref refs) to list of model id and element key tuples."""
 
-    if text is None:
-        return []
-    text = __b64_prepare(text)
-    bin_data = base64.b64decode(text)
-    buff = bytearray(MODEL_ID_SIZE + ELEMENT_ID_WITH_FLAGS_SIZE)
-    result = []
-    offset = 0
-    while offset < len(bin_data):
-        size = len(bin_data) - offset
-        if size < MODEL_ID_SIZE + ELEMENT_ID_WITH_FLAGS_SIZE:
-            break
-        buff[0:] = bin_data[offset:offset + MODEL_ID_SIZE + ELEMENT_ID_WITH_FLAGS_SIZE]
-        model_id = __make_web_safe(base64.b64encode(buff[0:MODEL_ID_SIZE]).decode('utf-8'))
-        element_key = __make_web_safe(base64.b64encode(buff[MODEL_ID_SIZE:]).decode('utf-8'))
-        result.append((model_id, element_key))
-        offset += MODEL_ID_SIZE + ELEMENT_ID_WITH_FLAGS_SIZE
-    return result
+    return XrefKeyArrayView(text).to_list()
 
 def new_element_key(key_flags: int) -> str:
     """ Creates new element key with given flags."""
@@ -178,6 +623,27 @@ def to_full_key(short_key: str, is_logical: bool = False) -> str:
     full_key[ELEMENT_FLAGS_SIZE:] = buff
     return __make_web_safe(base64.b64encode(full_key).decode('utf-8'))
 
+def to_full_keys(short_keys: Sequence[str], element_flags: int | Sequence[int | None] | None = None) -> List[str]:
+    """
+    Converts list of short keys to full keys. element_flags can be single value for all keys
+    or list of element flags (one for each key). Logical keys are created for logical elements.
+    All keys are converted at once.
+    """
+
+    count = len(short_keys)
+    if count == 0:
+        return []
+    rows = decode_keys_to_array(short_keys, ELEMENT_ID_SIZE)
+    if element_flags is None or isinstance(element_flags, int):
+        flags = np.full(count, element_flags or 0, dtype=np.uint32)
+    else:
+        flags = np.fromiter((f or 0 for f in element_flags), dtype=np.uint32, count=count)
+    key_flags = np.where(flags & ELEMENT_FLAGS_ALL_LOGICAL_MASK, KEY_FLAGS_LOGICAL, KEY_FLAGS_PHYSICAL).astype('>u4')
+    full_keys = np.empty((count, ELEMENT_ID_WITH_FLAGS_SIZE), dtype=np.uint8)
+    full_keys[:, :ELEMENT_FLAGS_SIZE] = key_flags.view(np.uint8).reshape(count, ELEMENT_FLAGS_SIZE)
+    full_keys[:, ELEMENT_FLAGS_SIZE:] = rows
+    return encode_keys_from_array(full_keys)
+
 def to_short_key(full_key: str) -> str:
     """ Converts full key to short key."""
 
@@ -187,6 +653,16 @@ def to_short_key(full_key: str) -> str:
     key[0:] = buff[ELEMENT_FLAGS_SIZE:]
     return __make_web_safe(base64.b64encode(key).decode('utf-8'))
 
+def to_short_keys(full_keys: Sequence[str]) -> List[str]:
+    """
+    Converts list of full keys to short keys. All keys are converted at once.
+    """
+
+    if len(full_keys) == 0:
+        return []
+    rows = decode_keys_to_array(full_keys, ELEMENT_ID_WITH_FLAGS_SIZE)
+    return encode_keys_from_array(rows[:, ELEMENT_FLAGS_SIZE:])
+
 def to_system_id(key: str) -> str:
     """
     Converts element key to system id.
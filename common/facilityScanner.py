@@ -0,0 +1,168 @@
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+from typing import Any, Callable, Iterator, List, Tuple
+
+from .constants import COLUMN_FAMILIES_STANDARD
+from .tandemClient import TandemClient
+
+QUEUE_TIMEOUT = 0.1
+
+class FacilityScanner:
+    """
+    Scans elements of multiple models concurrently. Elements are returned as they arrive together with
+    id of their model. Scan stops when consumer stops iteration or when scan is cancelled.
+
+    Models are scanned using shared client so number of workers should not exceed connection pool
+    size of the client (pool_maxsize).
+    """
+
+    def __init__(self, client: TandemClient, max_workers: int = 4, queue_size: int = 1000) -> None:
+        """
+        Creates new instance of FacilityScanner. max_workers is number of models scanned at same time.
+        queue_size limits number of elements waiting for consumer.
+        """
+
+        self.__client = client
+        self.__max_workers = max_workers
+        self.__queue_size = queue_size
+        self.__lock = threading.Lock()
+        self.__active: List[threading.Event] = []
+
+    def cancel(self) -> None:
+        """
+        Cancels all running scans. Iterators returned by scan stop before returning next element.
+        """
+
+        with self.__lock:
+            for event in self.__active:
+                event.set()
+
+    def find_elements(self,
+                      facility: Any,
+                      predicate: Callable[[Any], bool],
+                      columns: List[str] | None = None,
+                      limit: int | None = None,
+                      column_families: List[str] | None = None) -> List[Tuple[str, Any]]:
+        """
+        Returns list of (model_id, element) tuples of elements matching predicate. Predicate is evaluated
+        by workers while response is parsed. If columns are provided then only these columns are requested
+        (key is always returned), otherwise standard column family is used unless column_families are provided.
+        Once limit is reached all scans are stopped.
+        """
+
+        results = []
+        if limit is not None and limit <= 0:
+            return results
+        items = self.__scan(self.__get_model_ids(facility), column_families, columns, False, predicate)
+        try:
+            for item in items:
+                results.append(item)
+                if limit is not None and len(results) >= limit:
+                    break
+        finally:
+            # stops remaining scans
+            items.close()
+        return results
+
+    def scan(self,
+             facility: Any,
+             column_families: List[str] | None = None,
+             columns: List[str] | None = None,
+             include_history: bool = False) -> Iterator[Tuple[str, Any]]:
+        """
+        Returns iterator of (model_id, element) tuples for all models of the facility. facility can be
+        facility returned by get_facility or list of model ids. If neither column_families nor columns are
+        provided then standard column family is used. Order of elements of different models
+        is not defined. If scan of any model fails then exception is raised by the iterator and other
+        scans are stopped.
+        """
+
+        yield from self.__scan(self.__get_model_ids(facility), column_families, columns, include_history, None)
+
+    def __get_model_ids(self, facility: Any) -> List[str]:
+        if isinstance(facility, dict):
+            return [link.get('modelId') for link in facility.get('links', [])]
+        return list(facility)
+
+    def __put(self, items: queue.Queue, item: Any, cancel_event: threading.Event) -> bool:
+        # queue is bounded so wait until consumer makes space or scan is cancelled
+        while not cancel_event.is_set():
+            try:
+                items.put(item, timeout=QUEUE_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __scan(self,
+               model_ids: List[str],
+               column_families: List[str] | None,
+               columns: List[str] | None,
+               include_history: bool,
+               predicate: Callable[[Any], bool] | None) -> Iterator[Tuple[str, Any]]:
+        if len(model_ids) == 0:
+            return
+        # standard column family is used only if specific columns aren't requested
+        if column_families is None and (columns is None or len(columns) == 0):
+            column_families = [ COLUMN_FAMILIES_STANDARD ]
+        cancel_event = threading.Event()
+        items: queue.Queue = queue.Queue(maxsize=self.__queue_size)
+        with self.__lock:
+            self.__active.append(cancel_event)
+        executor = ThreadPoolExecutor(max_workers=min(self.__max_workers, len(model_ids)))
+        try:
+            for model_id in model_ids:
+                executor.submit(self.__scan_model, model_id, column_families, columns, include_history, predicate, items, cancel_event)
+            remaining = len(model_ids)
+            while remaining > 0:
+                try:
+                    item = items.get(timeout=QUEUE_TIMEOUT)
+                except queue.Empty:
+                    # workers don't report completion after cancellation
+                    if cancel_event.is_set():
+                        break
+                    continue
+                if item is None:
+                    remaining -= 1
+                    continue
+                if isinstance(item, BaseException):
+                    raise item
+                if cancel_event.is_set():
+                    break
+                yield item
+        finally:
+            # stop workers - either consumer exited early or scan is complete
+            cancel_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            with self.__lock:
+                self.__active.remove(cancel_event)
+
+    def __scan_model(self,
+                     model_id: str,
+                     column_families: List[str] | None,
+                     columns: List[str] | None,
+                     include_history: bool,
+                     predicate: Callable[[Any], bool] | None,
+                     items: queue.Queue,
+                     cancel_event: threading.Event) -> None:
+        result: Any = None
+        try:
+            if cancel_event.is_set():
+                return
+            elements = self.__client.iter_elements(model_id, column_families=column_families, columns=columns, include_history=include_history)
+            try:
+                for element in elements:
+                    if cancel_event.is_set():
+                        break
+                    if predicate is not None and not predicate(element):
+                        continue
+                    if not self.__put(items, (model_id, element), cancel_event):
+                        break
+            finally:
+                # closes response of the scan
+                elements.close()
+        except Exception as e:
+            result = e
+        finally:
+            self.__put(items, result, cancel_event)
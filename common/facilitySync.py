@@ -0,0 +1,104 @@
+import time
+from typing import Dict, List
+
+from .constants import (
+    COLUMN_FAMILIES_STANDARD,
+    ELEMENT_FLAGS_DELETED,
+    HC_KEYS,
+    HC_TIMESTAMP,
+    QC_ELEMENT_FLAGS,
+    QC_KEY
+)
+from .snapshotStore import SnapshotStore
+from .tandemClient import SCAN_KEYS_BATCH_SIZE, TandemClient
+
+class FacilitySync:
+    """
+    Keeps local snapshot of the facility up to date. First run downloads all elements of the model,
+    next runs use model history to download only changed elements.
+    """
+
+    def __init__(self, client: TandemClient, store: SnapshotStore, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD ], overlap: int = 60000) -> None:
+        """
+        Creates new instance of FacilitySync. overlap (milliseconds) is subtracted from the last synchronization
+        timestamp when history is requested to tolerate clock differences.
+        """
+
+        self.__client = client
+        self.__store = store
+        self.__column_families = column_families
+        self.__overlap = overlap
+
+    def sync_facility(self, facility_id: str) -> Dict[str, int]:
+        """
+        Synchronizes facility and all its models. Returns number of updated elements for each model.
+        """
+
+        facility = self.__client.get_facility(facility_id)
+        self.__store.save_facility(facility_id, facility)
+        result = {}
+
+        for link in facility.get('links', []):
+            model_id = link.get('modelId')
+            result[model_id] = self.sync_model(model_id)
+        return result
+
+    def sync_model(self, model_id: str) -> int:
+        """
+        Synchronizes elements of given model. Returns number of updated elements - elements which are changed
+        within overlap again aren't counted unless they differ from the snapshot.
+        """
+
+        mark = self.__store.get_sync_mark(model_id, self.__column_families)
+        if mark is None:
+            return self.__full_sync(model_id)
+        # STEP 1 - collect keys changed since last synchronization
+        history = self.__client.get_model_history(model_id, min=max(mark - self.__overlap, 1), include_changes=True)
+        changed_keys = set()
+        new_mark = mark
+
+        for item in history or []:
+            ts = item.get(HC_TIMESTAMP, None)
+            if ts is None:
+                continue
+            changed_keys.update(item.get(HC_KEYS, []))
+            new_mark = max(new_mark, ts)
+        if len(changed_keys) == 0:
+            return 0
+        # STEP 2 - download changed elements. Elements which aren't returned were deleted. History within overlap
+        # is received again so only elements which differ from the snapshot are updated.
+        keys = sorted(changed_keys)
+        stored = { element.get(QC_KEY): element for element in self.__store.get_elements(model_id, keys, self.__column_families) }
+        updated = []
+        deleted = []
+
+        for i in range(0, len(keys), SCAN_KEYS_BATCH_SIZE):
+            batch = keys[i:i + SCAN_KEYS_BATCH_SIZE]
+            found = set()
+
+            for element in self.__client.get_elements(model_id, element_ids=batch, column_families=self.__column_families):
+                key = element.get(QC_KEY)
+                found.add(key)
+                if element.get(QC_ELEMENT_FLAGS) == ELEMENT_FLAGS_DELETED:
+                    if key in stored:
+                        deleted.append(key)
+                elif self.__get_columns(element) != stored.get(key):
+                    updated.append(element)
+            deleted.extend(key for key in batch if key not in found and key in stored)
+        # STEP 3 - merge changes into local snapshot
+        self.__store.save_elements(model_id, self.__column_families, updated)
+        self.__store.delete_elements(model_id, deleted)
+        self.__store.set_sync_mark(model_id, self.__column_families, new_mark)
+        return len(updated) + len(deleted)
+
+    def __get_columns(self, element: Dict) -> Dict:
+        # returns element in same form as it is stored in snapshot (key and columns of synchronized families)
+        return { column: value for column, value in element.items() if column == QC_KEY or column.split(':', 1)[0] in self.__column_families }
+
+    def __full_sync(self, model_id: str) -> int:
+        # changes made during the scan are picked up by next synchronization
+        mark = int(time.time() * 1000)
+        elements = self.__client.iter_elements(model_id, column_families=self.__column_families)
+        count = self.__store.save_elements(model_id, self.__column_families, elements, replace=True)
+        self.__store.set_sync_mark(model_id, self.__column_families, mark)
+        return count
@@ -0,0 +1,107 @@
+import base64
+from typing import Any, Iterable, Iterator
+
+from .constants import (
+    ELEMENT_FLAGS_SIZE,
+    ELEMENT_ID_SIZE,
+    ELEMENT_ID_WITH_FLAGS_SIZE,
+    MODEL_ID_SIZE,
+    QC_ELEMENT_FLAGS,
+    QC_KEY
+)
+from .encoding import ElementKey, to_full_keys, to_xref_key
+from .utils import is_logical_element
+
+SHORT_KEY_LENGTH = (ELEMENT_ID_SIZE * 4 + 2) // 3
+
+class KeyIndex:
+    """
+    Index of elements of scanned model. Elements can be found by short key, full key, xref key
+    (with model id of the index) or ElementKey.
+    """
+
+    def __init__(self, model_id: str, elements: Iterable[Any]) -> None:
+        """
+        Creates new instance of KeyIndex. Elements are expected to contain key (k) column.
+        """
+
+        self.__model_id = model_id.replace('urn:adsk.dtm:', '')
+        self.__model_buff = base64.urlsafe_b64decode(self.__model_id + '=' * (-len(self.__model_id) % 4))
+        self.__elements = { element.get(QC_KEY): element for element in elements if isinstance(element, dict) }
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: str | ElementKey) -> Any:
+        element = self.get(key)
+        if element is None:
+            raise KeyError(key)
+        return element
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.__elements.values())
+
+    def __len__(self) -> int:
+        return len(self.__elements)
+
+    def get(self, key: object, default: Any = None) -> Any:
+        """
+        Returns element for given key. Key can be short key, full key, xref key or ElementKey.
+        """
+
+        short_key = self.to_short_key(key)
+        if short_key is None:
+            return default
+        return self.__elements.get(short_key, default)
+
+    def full_keys(self) -> dict[str, Any]:
+        """
+        Returns map of full keys to elements. Keys are converted at once.
+        """
+
+        short_keys = list(self.__elements.keys())
+        flags = [element.get(QC_ELEMENT_FLAGS) for element in self.__elements.values()]
+        return dict(zip(to_full_keys(short_keys, flags), self.__elements.values()))
+
+    def to_full_key(self, key: object) -> str | None:
+        """
+        Returns full key of indexed element. Key flags are based on element flags.
+        """
+
+        short_key = self.to_short_key(key)
+        element = self.__elements.get(short_key) if short_key is not None else None
+        if element is None:
+            return None
+        return ElementKey.from_short(short_key, is_logical_element(element.get(QC_ELEMENT_FLAGS) or 0)).full
+
+    def to_short_key(self, key: object) -> str | None:
+        """
+        Converts key in any form to short key. Returns None for xref keys of other models.
+        """
+
+        if isinstance(key, ElementKey):
+            return key.short
+        if not isinstance(key, str):
+            return None
+        if len(key) == SHORT_KEY_LENGTH:
+            return key
+        buff = base64.urlsafe_b64decode(key + '=' * (-len(key) % 4))
+        if len(buff) == ELEMENT_ID_WITH_FLAGS_SIZE:
+            id = buff[ELEMENT_FLAGS_SIZE:]
+        elif len(buff) == MODEL_ID_SIZE + ELEMENT_ID_WITH_FLAGS_SIZE:
+            if buff[:MODEL_ID_SIZE] != self.__model_buff:
+                return None
+            id = buff[MODEL_ID_SIZE + ELEMENT_FLAGS_SIZE:]
+        else:
+            return None
+        return base64.urlsafe_b64encode(id).decode('ascii').rstrip('=')
+
+    def to_xref_key(self, key: object) -> str | None:
+        """
+        Returns xref key of indexed element.
+        """
+
+        full_key = self.to_full_key(key)
+        if full_key is None:
+            return None
+        return to_xref_key(self.__model_id, full_key)
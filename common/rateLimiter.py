@@ -0,0 +1,197 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+ENDPOINT_CLASS_DEFAULT = 'default'
+ENDPOINT_CLASS_MUTATE = 'mutate'
+ENDPOINT_CLASS_SCAN = 'scan'
+ENDPOINT_CLASS_TIMESERIES = 'timeseries'
+ENDPOINT_CLASS_TWINS = 'twins'
+
+DEFAULT_RATES = {
+    ENDPOINT_CLASS_DEFAULT: 10.0,
+    ENDPOINT_CLASS_MUTATE: 5.0,
+    ENDPOINT_CLASS_SCAN: 10.0,
+    ENDPOINT_CLASS_TIMESERIES: 20.0,
+    ENDPOINT_CLASS_TWINS: 10.0
+}
+
+def get_endpoint_class(endpoint: str) -> str:
+    """
+    Returns rate limiter class of given endpoint (relative to Tandem API base url).
+    """
+
+    parts = endpoint.split('?', 1)[0].split('/')
+    if parts[0] == 'modeldata':
+        if parts[-1] in ('mutate', 'create'):
+            return ENDPOINT_CLASS_MUTATE
+        return ENDPOINT_CLASS_SCAN
+    if parts[0] == 'timeseries':
+        return ENDPOINT_CLASS_TIMESERIES
+    if parts[0] in ('twins', 'groups', 'models'):
+        return ENDPOINT_CLASS_TWINS
+    return ENDPOINT_CLASS_DEFAULT
+
+class MemoryBackend:
+    """
+    Keeps rate limiter state in memory of current process.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__state: Dict[str, Any] = {}
+
+    def update(self, func: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        Calls func with state. State can be modified by func. Call is atomic.
+        """
+
+        with self.__lock:
+            return func(self.__state)
+
+class FileBackend:
+    """
+    Keeps rate limiter state in local file. It can be used to share rate limits between processes
+    running on same machine.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.__path = path
+        self.__lock = threading.Lock()
+
+    def update(self, func: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        Calls func with state. State can be modified by func. Call is atomic across processes.
+        """
+
+        with self.__lock:
+            fd = os.open(self.__path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                self.__lock_file(fd)
+                try:
+                    with os.fdopen(os.dup(fd), 'r+') as file:
+                        text = file.read()
+                        state = json.loads(text) if text else {}
+                        result = func(state)
+                        file.seek(0)
+                        file.truncate()
+                        file.write(json.dumps(state))
+                    return result
+                finally:
+                    self.__unlock_file(fd)
+            finally:
+                os.close(fd)
+
+    def __lock_file(self, fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+    def __unlock_file(self, fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket rate limiter with separate bucket for each endpoint class. Rate is decreased
+    multiplicatively when API returns 429 and increased additively after successful calls
+    up to configured rate (AIMD).
+    """
+
+    def __init__(self,
+                 rates: Dict[str, float] | None = None,
+                 burst: float = 5.0,
+                 min_rate: float = 0.5,
+                 increase: float = 0.1,
+                 decrease_factor: float = 0.5,
+                 backend: MemoryBackend | FileBackend | None = None) -> None:
+        """
+        Creates new instance of AdaptiveRateLimiter. rates contains maximum number of requests per second
+        for each endpoint class. Use FileBackend to share limits between processes.
+        """
+
+        self.__rates = dict(DEFAULT_RATES)
+        if rates is not None:
+            self.__rates.update(rates)
+        self.__burst = burst
+        self.__min_rate = min_rate
+        self.__increase = increase
+        self.__decrease_factor = decrease_factor
+        self.__backend = backend if backend is not None else MemoryBackend()
+
+    def acquire(self, endpoint_class: str) -> None:
+        """
+        Waits until request of given endpoint class can be sent.
+        """
+
+        while True:
+            delay = self.__backend.update(lambda state: self.__take(state, endpoint_class))
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def get_rate(self, endpoint_class: str) -> float:
+        """
+        Returns current rate (requests per second) of given endpoint class.
+        """
+
+        return self.__backend.update(lambda state: self.__get_bucket(state, endpoint_class)['rate'])
+
+    def on_success(self, endpoint_class: str) -> None:
+        """
+        Increases rate of given endpoint class after successful call.
+        """
+
+        def update(state: Dict[str, Any]) -> None:
+            bucket = self.__get_bucket(state, endpoint_class)
+            bucket['rate'] = min(self.__get_max_rate(endpoint_class), bucket['rate'] + self.__increase)
+        self.__backend.update(update)
+
+    def on_throttle(self, endpoint_class: str) -> None:
+        """
+        Decreases rate of given endpoint class after call was throttled.
+        """
+
+        def update(state: Dict[str, Any]) -> None:
+            bucket = self.__get_bucket(state, endpoint_class)
+            bucket['rate'] = max(self.__min_rate, bucket['rate'] * self.__decrease_factor)
+            bucket['tokens'] = min(bucket['tokens'], 0.0)
+        self.__backend.update(update)
+
+    def __get_bucket(self, state: Dict[str, Any], endpoint_class: str) -> Dict[str, float]:
+        bucket = state.get(endpoint_class)
+        if bucket is None:
+            bucket = {
+                'rate': self.__get_max_rate(endpoint_class),
+                'tokens': self.__burst,
+                'updated': time.time()
+            }
+            state[endpoint_class] = bucket
+        return bucket
+
+    def __get_max_rate(self, endpoint_class: str) -> float:
+        return self.__rates.get(endpoint_class, self.__rates[ENDPOINT_CLASS_DEFAULT])
+
+    def __take(self, state: Dict[str, Any], endpoint_class: str) -> float:
+        bucket = self.__get_bucket(state, endpoint_class)
+        now = time.time()
+        elapsed = max(0.0, now - bucket['updated'])
+        bucket['tokens'] = min(self.__burst, bucket['tokens'] + elapsed * bucket['rate'])
+        bucket['updated'] = now
+        if bucket['tokens'] >= 1.0:
+            bucket['tokens'] -= 1.0
+            return 0.0
+        return (1.0 - bucket['tokens']) / bucket['rate']
@@ -0,0 +1,158 @@
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from .timeseries import TimeseriesFrame
+
+AGGREGATION_COUNT = 'count'
+AGGREGATION_LAST = 'last'
+AGGREGATION_MAX = 'max'
+AGGREGATION_MEAN = 'mean'
+AGGREGATION_MIN = 'min'
+# percentile is specified as p followed by number, i.e. p95
+AGGREGATION_PERCENTILE_PREFIX = 'p'
+
+def resample(timestamps: np.ndarray, values: np.ndarray, width: int, aggregations: List[str], origin: int = 0) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Aggregates values into buckets of given width (milliseconds). Buckets are aligned to origin. Timestamps are
+    expected to be sorted, missing values (NaN) are ignored. Returns start of non-empty buckets and map of
+    aggregation to array of aggregated values.
+    """
+
+    validate_aggregations(aggregations)
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    if not valid.all():
+        timestamps = timestamps[valid]
+        values = values[valid]
+    if len(timestamps) == 0:
+        return np.empty(0, dtype=np.int64), { a: np.empty(0, dtype=np.int64 if a == AGGREGATION_COUNT else np.float64) for a in aggregations }
+    buckets = (timestamps - origin) // width
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    ends = np.append(starts[1:], len(values))
+    counts = ends - starts
+    results: Dict[str, np.ndarray] = {}
+    sorted_values = None
+    for aggregation in aggregations:
+        if aggregation == AGGREGATION_COUNT:
+            results[aggregation] = counts
+        elif aggregation == AGGREGATION_LAST:
+            results[aggregation] = values[ends - 1]
+        elif aggregation == AGGREGATION_MAX:
+            results[aggregation] = np.maximum.reduceat(values, starts)
+        elif aggregation == AGGREGATION_MEAN:
+            results[aggregation] = np.add.reduceat(values, starts) / counts
+        elif aggregation == AGGREGATION_MIN:
+            results[aggregation] = np.minimum.reduceat(values, starts)
+        else:
+            if sorted_values is None:
+                # sort values within each bucket - buckets are already sorted
+                sorted_values = values[np.lexsort((values, buckets))]
+            q = float(aggregation[len(AGGREGATION_PERCENTILE_PREFIX):]) / 100
+            # linear interpolation - same as numpy.percentile
+            position = starts + q * (counts - 1)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.minimum(lower + 1, ends - 1)
+            fraction = position - lower
+            results[aggregation] = sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+    return buckets[starts] * width + origin, results
+
+class Resampler:
+    """
+    Resamples series which is received in parts (i.e. chunks of StreamDataFetcher). Values of bucket are kept
+    until bucket is complete so memory use depends on bucket width, not on length of the series.
+    """
+
+    def __init__(self, width: int, aggregations: List[str], origin: int = 0) -> None:
+        """
+        Creates new instance of Resampler. width is bucket width in milliseconds.
+        """
+
+        validate_aggregations(aggregations)
+        self.__width = width
+        self.__aggregations = aggregations
+        self.__origin = origin
+        self.__timestamps = np.empty(0, dtype=np.int64)
+        self.__values = np.empty(0, dtype=np.float64)
+
+    def add(self, timestamps: np.ndarray, values: np.ndarray, complete_before: int | None = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Adds next part of the series and returns aggregated buckets which are complete. Bucket is complete when
+        later value is received or when it ends before complete_before (i.e. end of current chunk).
+        """
+
+        timestamps = np.concatenate([self.__timestamps, np.asarray(timestamps, dtype=np.int64)])
+        values = np.concatenate([self.__values, np.asarray(values, dtype=np.float64)])
+        if len(timestamps) == 0:
+            return resample(timestamps, values, self.__width, self.__aggregations, self.__origin)
+        # last bucket can still receive values
+        limit = (timestamps[-1] - self.__origin) // self.__width * self.__width + self.__origin
+        if complete_before is not None:
+            limit = max(limit, (complete_before - self.__origin) // self.__width * self.__width + self.__origin)
+        count = np.searchsorted(timestamps, limit)
+        self.__timestamps = timestamps[count:]
+        self.__values = values[count:]
+        return resample(timestamps[:count], values[:count], self.__width, self.__aggregations, self.__origin)
+
+    def flush(self) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Returns aggregated values of remaining buckets.
+        """
+
+        timestamps = self.__timestamps
+        values = self.__values
+        self.__timestamps = np.empty(0, dtype=np.int64)
+        self.__values = np.empty(0, dtype=np.float64)
+        return resample(timestamps, values, self.__width, self.__aggregations, self.__origin)
+
+def resample_chunks(chunks: Iterable[Any],
+                    width: int,
+                    aggregations: List[str],
+                    origin: int = 0) -> Iterator[Tuple[str, str, np.ndarray, Dict[str, np.ndarray]]]:
+    """
+    Resamples data chunks returned by StreamDataFetcher as they arrive. Returns iterator of
+    (key, attribute, bucket starts, aggregated values) for completed buckets of each series.
+    """
+
+    resamplers: Dict[Tuple[str, str], Resampler] = {}
+    for chunk in chunks:
+        for item in chunk.items:
+            key = item.get('k', chunk.key)
+            attr = item.get('s')
+            resampler = resamplers.get((key, attr))
+            if resampler is None:
+                resampler = Resampler(width, aggregations, origin)
+                resamplers[(key, attr)] = resampler
+            # data of the stream up to end of the chunk is complete
+            buckets, results = resampler.add(item.get('t', []), item.get('v', []), chunk.to_date)
+            if len(buckets) > 0:
+                yield key, attr, buckets, results
+    for (key, attr), resampler in resamplers.items():
+        buckets, results = resampler.flush()
+        if len(buckets) > 0:
+            yield key, attr, buckets, results
+
+def resample_frame(frame: TimeseriesFrame, width: int, aggregations: List[str], origin: int = 0) -> Dict[Tuple[str, str], Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+    """
+    Resamples all series of the frame. Returns map of (key, attribute) to (bucket starts, aggregated values).
+    """
+
+    return { id: resample(*frame[id], width, aggregations, origin) for id in frame }
+
+def validate_aggregations(aggregations: List[str]) -> None:
+    """
+    Checks if aggregations are supported. Raises ValueError otherwise.
+    """
+
+    for aggregation in aggregations:
+        if aggregation in [AGGREGATION_COUNT, AGGREGATION_LAST, AGGREGATION_MAX, AGGREGATION_MEAN, AGGREGATION_MIN]:
+            continue
+        if aggregation.startswith(AGGREGATION_PERCENTILE_PREFIX):
+            try:
+                q = float(aggregation[len(AGGREGATION_PERCENTILE_PREFIX):])
+            except ValueError:
+                q = -1
+            if 0 <= q <= 100:
+                continue
+        raise ValueError(f'Unsupported aggregation: {aggregation}')
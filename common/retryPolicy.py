@@ -0,0 +1,135 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import random
+import threading
+from typing import Callable, Dict
+
+RETRY_STATUSES_THROTTLED = [ 429 ]
+RETRY_STATUSES_UNAVAILABLE = [ 500, 502, 503, 504 ]
+
+class RetryPolicy:
+    """
+    Describes how failed calls are retried. Throttled calls (429) are always retried because request wasn't
+    processed. Server errors and connection errors are retried only for idempotent calls (reads and scans).
+    Delay grows exponentially with random jitter. Retry-After header sent by server has precedence.
+    Timeouts are retried as connection errors unless retry_timeouts is False.
+    """
+
+    def __init__(self,
+                 max_retries: int = 5,
+                 backoff_factor: float = 0.5,
+                 max_backoff: float = 60.0,
+                 jitter: bool = True,
+                 throttled_statuses: list[int] = RETRY_STATUSES_THROTTLED,
+                 unavailable_statuses: list[int] = RETRY_STATUSES_UNAVAILABLE,
+                 respect_retry_after: bool = True,
+                 retry_timeouts: bool = True,
+                 on_retry: Callable[[str, str, int, int | None, float], None] | None = None) -> None:
+        """
+        Creates new instance of RetryPolicy. on_retry is called before each retry with method, endpoint,
+        attempt, status code (None in case of connection error) and delay in seconds.
+        """
+
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.throttled_statuses = set(throttled_statuses)
+        self.unavailable_statuses = set(unavailable_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.retry_timeouts = retry_timeouts
+        self.on_retry = on_retry
+
+    def get_delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """
+        Returns delay in seconds before next attempt. attempt starts from 0. Delay requested by server
+        (Retry-After) is limited by max_backoff.
+        """
+
+        if self.respect_retry_after and retry_after is not None:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return min(delay, self.max_backoff)
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def should_retry(self, attempt: int, status_code: int | None, idempotent: bool) -> bool:
+        """
+        Returns true if call should be retried. status_code is None in case of connection error.
+        """
+
+        if attempt >= self.max_retries:
+            return False
+        if status_code in self.throttled_statuses:
+            return True
+        if not idempotent:
+            return False
+        return status_code is None or status_code in self.unavailable_statuses
+
+class RetryStats:
+    """
+    Counters of calls and retries. Values are shared by all threads except last_retries which
+    contains number of retries of last call made by current thread.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.retries_by_status: Dict[int | None, int] = {}
+
+    @property
+    def last_retries(self) -> int:
+        return getattr(self.__local, 'retries', 0)
+
+    def record_call(self, retries: int, failed: bool) -> None:
+        """
+        Records finished call with number of its retries.
+        """
+
+        self.__local.retries = retries
+        with self.__lock:
+            self.calls += 1
+            self.retries += retries
+            if failed:
+                self.failures += 1
+
+    def record_retry(self, status_code: int | None) -> None:
+        """
+        Records retry caused by given status code (None in case of connection error).
+        """
+
+        with self.__lock:
+            self.retries_by_status[status_code] = self.retries_by_status.get(status_code, 0) + 1
+
+    def reset(self) -> None:
+        """
+        Resets all counters.
+        """
+
+        with self.__lock:
+            self.calls = 0
+            self.retries = 0
+            self.failures = 0
+            self.retries_by_status = {}
+
+def parse_retry_after(value: str) -> float | None:
+    """
+    Parses value of Retry-After header. It can be number of seconds or HTTP date.
+    """
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
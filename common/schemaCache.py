@@ -0,0 +1,112 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from .schemaIndex import SchemaIndex
+from .snapshotStore import SnapshotStore
+from .tandemClient import TandemClient
+
+CACHE_KIND_SCHEMA = 'schema'
+CACHE_KIND_TEMPLATE = 'template'
+
+def get_fingerprint(data: Any) -> str:
+    """
+    Returns fingerprint of given JSON payload.
+    """
+
+    text = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class SchemaCache:
+    """
+    Persistent cache of model schemas and facility templates. Payloads are stored together with version
+    fingerprint. Schema is validated against model properties and template is validated against facility.
+    Both are much smaller than cached payloads so full fetch happens only if something changed.
+
+    Store can be SnapshotStore or any object providing get_cache_entry, save_cache_entry and touch_cache_entry.
+    When it is shared by multiple processes (i.e. same SQLite file) then payloads are reused between runs.
+    """
+
+    def __init__(self,
+                 client: TandemClient,
+                 store: SnapshotStore,
+                 max_age: float = 0,
+                 schema_version: Callable[[str], Any] | None = None,
+                 template_version: Callable[[str], Any] | None = None) -> None:
+        """
+        Creates new instance of SchemaCache. Entries validated less than max_age seconds ago are returned
+        without validation. schema_version and template_version can be used to override the source of
+        version - they receive model id (facility id) and return JSON payload used to build fingerprint.
+        """
+
+        self.__client = client
+        self.__store = store
+        self.__max_age = max_age
+        self.__schema_version = schema_version or client.get_model_props
+        self.__template_version = template_version or client.get_facility
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_facility_template(self, facility_id: str) -> Any:
+        """
+        Returns template of given facility. Template is downloaded only if facility changed.
+        """
+
+        return self.__get(CACHE_KIND_TEMPLATE, facility_id, self.__template_version, self.__client.get_facility_template)
+
+    def get_model_schema(self, model_id: str, as_index: bool = False) -> Any:
+        """
+        Returns schema of given model. Schema is downloaded only if model changed. If as_index is True
+        then schema is returned as SchemaIndex.
+        """
+
+        result = self.__get(CACHE_KIND_SCHEMA, model_id, self.__schema_version, self.__client.get_model_schema)
+        if as_index:
+            return SchemaIndex(result)
+        return result
+
+    def invalidate(self, id: str | None = None) -> None:
+        """
+        Removes cached schema or template of given model or facility. If id is None then all entries are removed.
+        """
+
+        self.__store.delete_cache_entries(id=id)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns cache statistics.
+        """
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def __get(self, kind: str, id: str, version: Callable[[str], Any], fetch: Callable[[str], Any]) -> Any:
+        entry = self.__store.get_cache_entry(kind, id)
+        if entry is not None:
+            fingerprint, data, updated_at = entry
+            if time.time() * 1000 - updated_at < self.__max_age * 1000:
+                self.__count(True)
+                return data
+            current = get_fingerprint(version(id))
+            if current == fingerprint:
+                self.__store.touch_cache_entry(kind, id)
+                self.__count(True)
+                return data
+        else:
+            current = get_fingerprint(version(id))
+        self.__count(False)
+        data = fetch(id)
+        self.__store.save_cache_entry(kind, id, current, data)
+        return data
+
+    def __count(self, hit: bool) -> None:
+        with self.__lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
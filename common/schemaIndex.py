@@ -0,0 +1,117 @@
+from typing import Any, Dict, Iterator, List, Tuple
+
+class SchemaIndex:
+    """
+    Index of model schema. Attributes can be found by id, (category, name), (family, column) or data type
+    without scanning list of attributes.
+    """
+
+    def __init__(self, schema: Any) -> None:
+        """
+        Creates new instance of SchemaIndex from schema returned by get_model_schema.
+        """
+
+        self.__schema = schema
+        self.__attributes: List[Any] = schema.get('attributes', []) if schema is not None else []
+        self.__by_id: Dict[str, Any] = {}
+        self.__by_name: Dict[str, Any] = {}
+        self.__by_category_name: Dict[Tuple[str, str], Any] = {}
+        self.__by_column: Dict[Tuple[str, str], Any] = {}
+        self.__by_data_type: Dict[int, List[Any]] = {}
+        self.__by_family: Dict[str, List[Any]] = {}
+        self.__allowed_values: Dict[str, Dict[Any, Any]] = {}
+
+        for attr in self.__attributes:
+            # first attribute wins in case of duplicates - same as next() over the list
+            self.__by_id.setdefault(attr.get('id'), attr)
+            self.__by_name.setdefault(attr.get('name'), attr)
+            self.__by_category_name.setdefault((attr.get('category'), attr.get('name')), attr)
+            self.__by_column.setdefault((attr.get('fam'), attr.get('col')), attr)
+            self.__by_data_type.setdefault(attr.get('dataType'), []).append(attr)
+            self.__by_family.setdefault(attr.get('fam'), []).append(attr)
+
+    def __contains__(self, prop_id: object) -> bool:
+        return prop_id in self.__by_id
+
+    def __getitem__(self, prop_id: str) -> Any:
+        return self.__by_id[prop_id]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.__attributes)
+
+    def __len__(self) -> int:
+        return len(self.__attributes)
+
+    @property
+    def attributes(self) -> List[Any]:
+        """
+        Returns list of attributes.
+        """
+
+        return self.__attributes
+
+    @property
+    def schema(self) -> Any:
+        """
+        Returns original schema.
+        """
+
+        return self.__schema
+
+    def find(self, category: str, name: str) -> Any | None:
+        """
+        Returns attribute with given category and name.
+        """
+
+        return self.__by_category_name.get((category, name))
+
+    def find_by_name(self, name: str) -> Any | None:
+        """
+        Returns first attribute with given name.
+        """
+
+        return self.__by_name.get(name)
+
+    def get(self, prop_id: str, default: Any = None) -> Any:
+        """
+        Returns attribute with given id (qualified column, i.e. z:5Q).
+        """
+
+        return self.__by_id.get(prop_id, default)
+
+    def get_allowed_values(self, prop_id: str) -> Dict[Any, Any]:
+        """
+        Returns reverse map of allowed values for given attribute (value to name). It can be used to convert
+        values of discrete properties (i.e. stream data) to strings. Returns empty map if attribute doesn't
+        have allowed values.
+        """
+
+        result = self.__allowed_values.get(prop_id)
+        if result is None:
+            attr = self.__by_id.get(prop_id)
+            allowed_values = attr.get('allowedValues') if attr is not None else None
+            value_map = allowed_values.get('map') if allowed_values is not None else None
+            result = { value: key for key, value in value_map.items() } if value_map is not None else {}
+            self.__allowed_values[prop_id] = result
+        return result
+
+    def get_by_column(self, family: str, column: str) -> Any | None:
+        """
+        Returns attribute with given family and column name.
+        """
+
+        return self.__by_column.get((family, column))
+
+    def get_by_data_type(self, data_type: int) -> List[Any]:
+        """
+        Returns attributes of given data type.
+        """
+
+        return self.__by_data_type.get(data_type, [])
+
+    def get_by_family(self, family: str) -> List[Any]:
+        """
+        Returns attributes of given column family.
+        """
+
+        return self.__by_family.get(family, [])
@@ -0,0 +1,417 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .constants import (
+    COLUMN_FAMILIES_REFS,
+    COLUMN_FAMILIES_STANDARD,
+    QC_CLASSIFICATION,
+    QC_ELEMENT_FLAGS,
+    QC_KEY,
+    QC_LEVEL,
+    QC_NAME,
+    QC_OCLASSIFICATION,
+    QC_ONAME,
+    QC_ROOMS
+)
+from .encoding import from_short_key_array
+from .tandemClient import TandemClient
+
+# number of elements written to staging table at once
+STAGING_BATCH_SIZE = 1000
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS facilities (
+        facility_id TEXT PRIMARY KEY,
+        data TEXT NOT NULL,
+        updated_at INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS schemas (
+        model_id TEXT PRIMARY KEY,
+        data TEXT NOT NULL,
+        updated_at INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS elements (
+        model_id TEXT NOT NULL,
+        key TEXT NOT NULL,
+        flags INTEGER,
+        level TEXT,
+        classification TEXT,
+        name TEXT,
+        PRIMARY KEY (model_id, key)
+    )
+    """,
+    'CREATE INDEX IF NOT EXISTS elements_flags ON elements (model_id, flags)',
+    'CREATE INDEX IF NOT EXISTS elements_level ON elements (model_id, level)',
+    'CREATE INDEX IF NOT EXISTS elements_classification ON elements (model_id, classification)',
+    'CREATE INDEX IF NOT EXISTS elements_name ON elements (model_id, name)',
+    """
+    CREATE TABLE IF NOT EXISTS element_rooms (
+        model_id TEXT NOT NULL,
+        key TEXT NOT NULL,
+        room TEXT NOT NULL,
+        PRIMARY KEY (model_id, key, room)
+    )
+    """,
+    'CREATE INDEX IF NOT EXISTS element_rooms_room ON element_rooms (model_id, room)',
+    """
+    CREATE TABLE IF NOT EXISTS sync_marks (
+        model_id TEXT NOT NULL,
+        families TEXT NOT NULL,
+        timestamp INTEGER NOT NULL,
+        PRIMARY KEY (model_id, families)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS element_columns (
+        model_id TEXT NOT NULL,
+        family TEXT NOT NULL,
+        key TEXT NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (model_id, family, key)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        kind TEXT NOT NULL,
+        id TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        data TEXT NOT NULL,
+        updated_at INTEGER NOT NULL,
+        PRIMARY KEY (kind, id)
+    )
+    """
+]
+
+class SnapshotStore:
+    """
+    Local snapshot of facility data stored in SQLite database. It keeps facility, model schemas and
+    scanned elements. Elements are stored per column family and indexed by key, flags, level, rooms,
+    classification and name.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Creates new instance of SnapshotStore. Database is created if it doesn't exist.
+        """
+
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__lock = threading.RLock()
+        self.__staging_count = 0
+        with self.__lock, self.__connection:
+            self.__connection.execute('PRAGMA journal_mode=WAL')
+            for statement in SCHEMA:
+                self.__connection.execute(statement)
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes database.
+        """
+
+        with self.__lock:
+            self.__connection.close()
+
+    def delete_cache_entries(self, kind: str | None = None, id: str | None = None) -> None:
+        """
+        Removes cached payloads. If kind or id is None then entries of all kinds or ids are removed.
+        """
+
+        conditions = []
+        params: List[Any] = []
+        if kind is not None:
+            conditions.append('kind = ?')
+            params.append(kind)
+        if id is not None:
+            conditions.append('id = ?')
+            params.append(id)
+        query = 'DELETE FROM cache_entries'
+        if len(conditions) > 0:
+            query += f' WHERE {" AND ".join(conditions)}'
+        with self.__lock, self.__connection:
+            self.__connection.execute(query, params)
+
+    def delete_elements(self, model_id: str, keys: List[str]) -> None:
+        """
+        Removes given elements of the model from the snapshot.
+        """
+
+        with self.__lock, self.__connection:
+            for table in ['elements', 'element_rooms', 'element_columns']:
+                self.__connection.executemany(f'DELETE FROM {table} WHERE model_id = ? AND key = ?',
+                                              [(model_id, key) for key in keys])
+
+    def find_elements(self,
+                      model_id: str,
+                      column_families: List[str] | None = None,
+                      flags: int | None = None,
+                      level: str | None = None,
+                      room: str | None = None,
+                      classification: str | None = None,
+                      name: str | None = None) -> List[Any]:
+        """
+        Returns elements of the model which match all given filters. Classification filter matches
+        classifications starting with given value.
+        """
+
+        conditions = ['e.model_id = ?']
+        params: List[Any] = [model_id]
+        if flags is not None:
+            conditions.append('e.flags = ?')
+            params.append(flags)
+        if level is not None:
+            conditions.append('e.level = ?')
+            params.append(level)
+        if classification is not None:
+            conditions.append("e.classification LIKE ? ESCAPE '\\'")
+            params.append(classification.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        if name is not None:
+            conditions.append('e.name = ?')
+            params.append(name)
+        if room is not None:
+            conditions.append('EXISTS (SELECT 1 FROM element_rooms r WHERE r.model_id = e.model_id AND r.key = e.key AND r.room = ?)')
+            params.append(room)
+        query = f'SELECT e.key FROM elements e WHERE {" AND ".join(conditions)}'
+        with self.__lock:
+            keys = [row[0] for row in self.__connection.execute(query, params)]
+        return self.get_elements(model_id, keys, column_families)
+
+    def get_cache_entry(self, kind: str, id: str) -> Tuple[str, Any, int] | None:
+        """
+        Returns cached payload as (fingerprint, data, updated_at) tuple or None if payload isn't stored.
+        updated_at is time of last validation in milliseconds.
+        """
+
+        with self.__lock:
+            row = self.__connection.execute('SELECT fingerprint, data, updated_at FROM cache_entries WHERE kind = ? AND id = ?',
+                                            (kind, id)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), row[2]
+
+    def get_elements(self, model_id: str, keys: List[str] | None = None, column_families: List[str] | None = None) -> List[Any]:
+        """
+        Returns elements of the model. Columns of requested column families are merged to single element.
+        If column_families is None then all stored families are returned.
+        """
+
+        query = 'SELECT key, data FROM element_columns WHERE model_id = ?'
+        params: List[Any] = [model_id]
+        if column_families is not None:
+            query += f' AND family IN ({",".join("?" * len(column_families))})'
+            params.extend(column_families)
+        if keys is not None:
+            if len(keys) == 0:
+                return []
+            query += ' AND key IN (SELECT key FROM temp.snapshot_keys)'
+        query += ' ORDER BY key'
+        results = []
+
+        with self.__lock:
+            if keys is not None:
+                self.__set_keys(keys)
+            for key, data in self.__connection.execute(query, params):
+                if len(results) == 0 or results[-1].get(QC_KEY) != key:
+                    results.append({ QC_KEY: key })
+                results[-1].update(json.loads(data))
+        return results
+
+    def get_facility(self, facility_id: str) -> Any | None:
+        """
+        Returns stored facility or None if facility isn't stored.
+        """
+
+        return self.__get_document('facilities', 'facility_id', facility_id)
+
+    def get_model_schema(self, model_id: str) -> Any | None:
+        """
+        Returns stored schema of the model or None if schema isn't stored.
+        """
+
+        return self.__get_document('schemas', 'model_id', model_id)
+
+    def get_sync_mark(self, model_id: str, column_families: List[str]) -> int | None:
+        """
+        Returns timestamp of last synchronization of given column families of the model.
+        """
+
+        with self.__lock:
+            row = self.__connection.execute('SELECT timestamp FROM sync_marks WHERE model_id = ? AND families = ?',
+                                            (model_id, ','.join(sorted(column_families)))).fetchone()
+        if row is None:
+            return None
+        return row[0]
+
+    def save_cache_entry(self, kind: str, id: str, fingerprint: str, data: Any) -> None:
+        """
+        Stores payload of given kind (i.e. schema) together with its version fingerprint.
+        """
+
+        with self.__lock, self.__connection:
+            self.__connection.execute('INSERT OR REPLACE INTO cache_entries (kind, id, fingerprint, data, updated_at) VALUES (?, ?, ?, ?, ?)',
+                                      (kind, id, fingerprint, json.dumps(data), int(time.time() * 1000)))
+
+    def save_elements(self, model_id: str, column_families: List[str], elements: Iterable[Any], replace: bool = False) -> int:
+        """
+        Stores scanned elements. column_families should be same as families used for scan. If replace is set
+        to True then previously stored data of these families is removed. Elements are staged while they are received
+        and stored at once, so snapshot is replaced atomically. Returns number of stored elements.
+        """
+
+        update_standard = COLUMN_FAMILIES_STANDARD in column_families
+        update_refs = COLUMN_FAMILIES_REFS in column_families
+        count = 0
+        # elements are received (i.e. from scan) into temporary table first, so database isn't locked while
+        # they are received. Snapshot is then updated from staged elements in single transaction.
+        staging = self.__create_staging()
+        try:
+            batch = []
+            for element in elements:
+                if not isinstance(element, dict):
+                    continue
+                batch.append((json.dumps(element),))
+                if len(batch) >= STAGING_BATCH_SIZE:
+                    self.__stage(staging, batch)
+                    batch = []
+            self.__stage(staging, batch)
+            with self.__lock, self.__connection:
+                if replace:
+                    for family in column_families:
+                        self.__connection.execute('DELETE FROM element_columns WHERE model_id = ? AND family = ?', (model_id, family))
+                    # index columns are set again from new data
+                    if update_standard:
+                        self.__connection.execute('UPDATE elements SET flags = NULL, classification = NULL, name = NULL WHERE model_id = ?', (model_id,))
+                    if update_refs:
+                        self.__connection.execute('UPDATE elements SET level = NULL WHERE model_id = ?', (model_id,))
+                        self.__connection.execute('DELETE FROM element_rooms WHERE model_id = ?', (model_id,))
+                    # elements without any stored family are removed
+                    self.__connection.execute("""
+                        DELETE FROM elements WHERE model_id = ? AND NOT EXISTS
+                        (SELECT 1 FROM element_columns c WHERE c.model_id = elements.model_id AND c.key = elements.key)
+                    """, (model_id,))
+                    self.__connection.execute("""
+                        DELETE FROM element_rooms WHERE model_id = ? AND NOT EXISTS
+                        (SELECT 1 FROM elements e WHERE e.model_id = element_rooms.model_id AND e.key = element_rooms.key)
+                    """, (model_id,))
+                for (text,) in self.__connection.execute(f'SELECT data FROM {staging} ORDER BY rowid'):
+                    element = json.loads(text)
+                    key = element.get(QC_KEY)
+                    columns: Dict[str, Dict[str, Any]] = { family: {} for family in column_families }
+
+                    for column, value in element.items():
+                        family = column.split(':', 1)[0]
+                        if family in columns:
+                            columns[family][column] = value
+                    self.__connection.executemany('INSERT OR REPLACE INTO element_columns (model_id, family, key, data) VALUES (?, ?, ?, ?)',
+                                                  [(model_id, family, key, json.dumps(data)) for family, data in columns.items()])
+                    self.__connection.execute('INSERT OR IGNORE INTO elements (model_id, key) VALUES (?, ?)', (model_id, key))
+                    if update_standard:
+                        self.__connection.execute('UPDATE elements SET flags = ?, classification = ?, name = ? WHERE model_id = ? AND key = ?',
+                                                  (element.get(QC_ELEMENT_FLAGS),
+                                                   element.get(QC_OCLASSIFICATION) or element.get(QC_CLASSIFICATION),
+                                                   element.get(QC_ONAME) or element.get(QC_NAME),
+                                                   model_id,
+                                                   key))
+                    if update_refs:
+                        self.__connection.execute('UPDATE elements SET level = ? WHERE model_id = ? AND key = ?',
+                                                  (element.get(QC_LEVEL), model_id, key))
+                        self.__connection.execute('DELETE FROM element_rooms WHERE model_id = ? AND key = ?', (model_id, key))
+                        room_ref = element.get(QC_ROOMS)
+                        if room_ref is not None:
+                            self.__connection.executemany('INSERT OR IGNORE INTO element_rooms (model_id, key, room) VALUES (?, ?, ?)',
+                                                          [(model_id, key, room) for room in from_short_key_array(room_ref)])
+                    count += 1
+        finally:
+            with self.__lock, self.__connection:
+                self.__connection.execute(f'DROP TABLE IF EXISTS {staging}')
+        return count
+
+    def save_facility(self, facility_id: str, facility: Any) -> None:
+        """
+        Stores facility.
+        """
+
+        self.__set_document('facilities', 'facility_id', facility_id, facility)
+
+    def save_facility_snapshot(self, client: TandemClient, facility_id: str, column_families: List[str]) -> None:
+        """
+        Downloads facility, schemas and elements of all facility models and stores them.
+        """
+
+        facility = client.get_facility(facility_id)
+        self.save_facility(facility_id, facility)
+        for link in facility.get('links', []):
+            model_id = link.get('modelId')
+            self.save_model_schema(model_id, client.get_model_schema(model_id))
+            self.save_elements(model_id, column_families, client.iter_elements(model_id, column_families=column_families), replace=True)
+
+    def save_model_schema(self, model_id: str, schema: Any) -> None:
+        """
+        Stores schema of the model.
+        """
+
+        self.__set_document('schemas', 'model_id', model_id, schema)
+
+    def set_sync_mark(self, model_id: str, column_families: List[str], timestamp: int) -> None:
+        """
+        Stores timestamp of last synchronization of given column families of the model.
+        """
+
+        with self.__lock, self.__connection:
+            self.__connection.execute('INSERT OR REPLACE INTO sync_marks (model_id, families, timestamp) VALUES (?, ?, ?)',
+                                      (model_id, ','.join(sorted(column_families)), timestamp))
+
+    def touch_cache_entry(self, kind: str, id: str) -> None:
+        """
+        Marks cached payload as validated now.
+        """
+
+        with self.__lock, self.__connection:
+            self.__connection.execute('UPDATE cache_entries SET updated_at = ? WHERE kind = ? AND id = ?',
+                                      (int(time.time() * 1000), kind, id))
+
+    def __create_staging(self) -> str:
+        # each call uses its own table so elements can be saved from multiple threads
+        with self.__lock, self.__connection:
+            self.__staging_count += 1
+            staging = f'temp.snapshot_staging_{self.__staging_count}'
+            self.__connection.execute(f'CREATE TABLE {staging} (data TEXT NOT NULL)')
+        return staging
+
+    def __get_document(self, table: str, id_column: str, id: str) -> Any | None:
+        with self.__lock:
+            row = self.__connection.execute(f'SELECT data FROM {table} WHERE {id_column} = ?', (id,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def __set_document(self, table: str, id_column: str, id: str, data: Any) -> None:
+        with self.__lock, self.__connection:
+            self.__connection.execute(f'INSERT OR REPLACE INTO {table} ({id_column}, data, updated_at) VALUES (?, ?, ?)',
+                                      (id, json.dumps(data), int(time.time() * 1000)))
+
+    def __stage(self, staging: str, rows: List[Tuple[str]]) -> None:
+        # temporary table is private to the connection - other writers to database aren't blocked
+        if len(rows) == 0:
+            return
+        with self.__lock, self.__connection:
+            self.__connection.executemany(f'INSERT INTO {staging} (data) VALUES (?)', rows)
+
+    def __set_keys(self, keys: List[str]) -> None:
+        # keys are passed through temporary table to avoid limit of SQL parameters
+        with self.__lock, self.__connection:
+            self.__connection.execute('CREATE TEMP TABLE IF NOT EXISTS snapshot_keys (key TEXT PRIMARY KEY)')
+            self.__connection.execute('DELETE FROM temp.snapshot_keys')
+            self.__connection.executemany('INSERT OR IGNORE INTO temp.snapshot_keys (key) VALUES (?)', [(key,) for key in keys])
@@ -0,0 +1,133 @@
+import csv
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .streamFetcher import StreamDataFetcher
+from .timeseries import TimeseriesFrame
+
+EXPORT_FORMAT_CSV = 'csv'
+EXPORT_FORMAT_PARQUET = 'parquet'
+
+class CsvWriter:
+    """
+    Writes exported rows to CSV file. Timestamps are written in human-readable format (UTC), missing values are empty.
+    """
+
+    def __init__(self, path: str, column_names: List[str]) -> None:
+        self.__file = open(path, 'w', newline='', encoding='utf-8')
+        self.__writer = csv.writer(self.__file)
+        self.__writer.writerow(['timestamp'] + column_names)
+
+    def close(self) -> None:
+        self.__file.close()
+
+    def write(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        dates = np.char.replace(np.datetime_as_string(timestamps.astype('datetime64[ms]'), unit='s'), 'T', ' ')
+        texts = values.astype(str)
+        texts[np.isnan(values)] = ''
+        self.__writer.writerows(np.column_stack([dates, texts]).tolist())
+
+class ParquetWriter:
+    """
+    Writes exported rows to Parquet file. Each write is stored as separate row group. Requires pyarrow.
+    """
+
+    def __init__(self, path: str, column_names: List[str]) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError('pyarrow is required to export stream data to Parquet: pip install pyarrow') from e
+        self.__pa = pa
+        self.__column_names = column_names
+        fields = [pa.field('timestamp', pa.timestamp('ms', tz='UTC'))] + [pa.field(name, pa.float64()) for name in column_names]
+        self.__schema = pa.schema(fields)
+        self.__writer = pq.ParquetWriter(path, self.__schema)
+
+    def close(self) -> None:
+        self.__writer.close()
+
+    def write(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        pa = self.__pa
+        arrays = [pa.array(timestamps, type=pa.timestamp('ms', tz='UTC'))]
+        for i in range(len(self.__column_names)):
+            arrays.append(pa.array(values[:, i], mask=np.isnan(values[:, i])))
+        self.__writer.write_table(pa.Table.from_arrays(arrays, schema=self.__schema))
+
+def export_stream_data(fetcher: StreamDataFetcher,
+                       model_id: str,
+                       columns: Dict[Tuple[str, str], str],
+                       from_date: int,
+                       to_date: int,
+                       path: str,
+                       export_format: str | None = None,
+                       resolution: int = 1000,
+                       flush_points: int = 1000000) -> int:
+    """
+    Exports stream data to CSV or Parquet file with bounded memory. columns is map of (stream key, attribute id)
+    to column name. Data is fetched by windows, merged by timestamp and written incrementally. Timestamps are
+    rounded down to resolution (milliseconds) - if there are multiple values of series within same row then last
+    one is used. Buffered data is written once it exceeds flush_points values. If export_format isn't provided
+    then it is detected from file extension. Returns number of written rows.
+    """
+
+    if export_format is None:
+        export_format = EXPORT_FORMAT_PARQUET if path.lower().endswith('.parquet') else EXPORT_FORMAT_CSV
+    if export_format == EXPORT_FORMAT_PARQUET:
+        writer: Any = ParquetWriter(path, list(columns.values()))
+    elif export_format == EXPORT_FORMAT_CSV:
+        writer = CsvWriter(path, list(columns.values()))
+    else:
+        raise ValueError(f'Unsupported export format: {export_format}')
+    keys = list(dict.fromkeys(key for key, _ in columns))
+    attrs = list(dict.fromkeys(attr for _, attr in columns))
+    # values received but not written yet - list of timestamp & value arrays per series
+    pending: Dict[Tuple[str, str], List[Tuple[np.ndarray, np.ndarray]]] = { id: [] for id in columns }
+    pending_points = 0
+    boundary = None
+    row_count = 0
+    try:
+        for chunk in fetcher.fetch(model_id, keys, from_date, to_date, attrs=attrs):
+            # chunks are ordered by start of window so rows before start of the chunk are complete
+            chunk_boundary = chunk.from_date // resolution * resolution
+            if pending_points >= flush_points and boundary is not None and chunk_boundary > boundary:
+                row_count += __flush(writer, pending, chunk_boundary, resolution)
+                pending_points = sum(len(t) for parts in pending.values() for t, _ in parts)
+            boundary = chunk_boundary
+            for item in chunk.items:
+                parts = pending.get((item.get('k', chunk.key), item.get('s')))
+                if parts is None:
+                    continue
+                timestamps = np.asarray(item.get('t', []), dtype=np.int64)
+                parts.append((timestamps, np.asarray(item.get('v', []), dtype=np.float64)))
+                pending_points += len(timestamps)
+        row_count += __flush(writer, pending, None, resolution)
+    finally:
+        writer.close()
+    return row_count
+
+def __flush(writer: Any, pending: Dict[Tuple[str, str], List[Tuple[np.ndarray, np.ndarray]]], boundary: int | None, resolution: int) -> int:
+    # writes values before boundary (all values if boundary is None), remaining values are kept
+    series = {}
+    for id, parts in pending.items():
+        if len(parts) == 0:
+            continue
+        timestamps = np.concatenate([t for t, _ in parts])
+        values = np.concatenate([v for _, v in parts])
+        count = len(timestamps) if boundary is None else np.searchsorted(timestamps, boundary)
+        parts.clear()
+        if count < len(timestamps):
+            parts.append((timestamps[count:], values[count:]))
+        # series without values in this flush are left out and written as empty values
+        if count > 0:
+            series[id] = (timestamps[:count], values[:count])
+    if len(series) == 0:
+        return 0
+    timestamps, columns, values = TimeseriesFrame(series).pivot(resolution)
+    # place values to columns of the output
+    positions = { id: i for i, id in enumerate(pending) }
+    result = np.full((len(timestamps), len(pending)), np.nan, dtype=np.float64)
+    result[:, [positions[id] for id in columns]] = values
+    writer.write(timestamps, result)
+    return len(timestamps)
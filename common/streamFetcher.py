@@ -0,0 +1,149 @@
+from bisect import bisect_left
+import copy
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import heapq
+from typing import Any, Dict, Iterator, List, NamedTuple, Tuple
+
+import requests
+
+from .tandemClient import TandemApiError, TandemClient
+
+MINUTE_MS = 60 * 1000
+DAY_MS = 24 * 60 * MINUTE_MS
+# statuses which indicate that window is too large
+SPLIT_STATUSES = [413, 504]
+
+class StreamDataChunk(NamedTuple):
+    """
+    Data of single stream for time window. Window includes from_date and excludes to_date
+    (except last window of the range). items uses same format as query_stream_data -
+    list of { 's': attribute, 't': timestamps, 'v': values }.
+    """
+
+    key: str
+    from_date: int
+    to_date: int
+    items: List[Any]
+
+class StreamDataFetcher:
+    """
+    Fetches stream data for long time ranges. Range is split into windows which are fetched concurrently
+    across streams and windows. Window size adapts to density of the stream so each request returns
+    about max_points values. Window which fails because it is too large (413, 504 or timeout) is split in halves -
+    such failures aren't retried by the client.
+    """
+
+    def __init__(self,
+                 client: TandemClient,
+                 max_workers: int = 4,
+                 window: int = DAY_MS,
+                 min_window: int = MINUTE_MS,
+                 max_window: int = 30 * DAY_MS,
+                 max_points: int = 100000,
+                 max_buffered: int | None = None,
+                 timeout: float | None = None) -> None:
+        """
+        Creates new instance of StreamDataFetcher. Window sizes are in milliseconds. window is size of
+        first window of each stream. max_buffered limits number of fetched chunks waiting for earlier
+        windows (default is twice the number of workers) - no new windows are requested above the limit. timeout
+        (seconds) limits waiting for single window - window is split once it expires (default is timeout of the client).
+        """
+
+        self.__client = client
+        self.__max_workers = max_workers
+        self.__window = window
+        self.__min_window = min_window
+        self.__max_window = max_window
+        self.__max_points = max_points
+        self.__max_buffered = max_buffered if max_buffered is not None else 2 * max_workers
+        self.__timeout = timeout
+        # window which is too large is split immediately instead of being retried
+        self.__retry_policy = copy.copy(client.retry_policy)
+        self.__retry_policy.unavailable_statuses = self.__retry_policy.unavailable_statuses - set(SPLIT_STATUSES)
+        self.__retry_policy.retry_timeouts = False
+
+    def fetch(self, model_id: str, keys: List[str], from_date: int, to_date: int, attrs: List[str] | None = None) -> Iterator[StreamDataChunk]:
+        """
+        Returns iterator of data chunks for given streams and time range (from_date and to_date are
+        included). Chunks are returned ordered by start of their window - chunks of each stream are
+        returned in timestamp order. Stopping iteration cancels pending requests.
+        """
+
+        # window size of each stream
+        windows = [self.__window for _ in keys]
+        # start of next window of each stream ordered by time - streams are fetched close to same point in time
+        pending = [(from_date, i) for i in range(len(keys))]
+        heapq.heapify(pending)
+        running: Dict[Future, Tuple[int, int, int]] = {}
+        completed: List[Tuple[int, int, StreamDataChunk]] = []
+        executor = ThreadPoolExecutor(max_workers=self.__max_workers)
+        try:
+            while len(pending) > 0 or len(running) > 0:
+                # keep workers busy - multiple windows of same stream can be fetched at same time. If too many
+                # chunks wait for slow window then only that window is fetched (it is first pending one when
+                # nothing is running)
+                while len(pending) > 0 and len(running) < self.__max_workers and \
+                        (len(completed) < self.__max_buffered or len(running) == 0):
+                    start, i = heapq.heappop(pending)
+                    end = min(start + windows[i], to_date + 1)
+                    future = executor.submit(self.__fetch_window, model_id, keys[i], attrs, start, end, end > to_date)
+                    running[future] = (start, end, i)
+                    if end <= to_date:
+                        heapq.heappush(pending, (end, i))
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, end, i = running.pop(future)
+                    items = future.result()
+                    windows[i] = self.__next_window(end - start, items)
+                    heapq.heappush(completed, (start, i, StreamDataChunk(keys[i], start, end, items)))
+                # chunk can be returned once all earlier windows are complete
+                frontier = min([(start, i) for start, _, i in running.values()] + pending, default=None)
+                while len(completed) > 0 and (frontier is None or completed[0][:2] < frontier):
+                    yield heapq.heappop(completed)[2]
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __fetch_window(self, model_id: str, key: str, attrs: List[str] | None, start: int, end: int, last: bool) -> List[Any]:
+        try:
+            result = self.__client.query_stream_data(model_id, [key], attrs=attrs, from_date=start, to_date=end - 1 if last else end,
+                                                     retry_policy=self.__retry_policy, timeout=self.__timeout)
+        except (TandemApiError, requests.Timeout) as e:
+            if isinstance(e, TandemApiError) and e.status_code not in SPLIT_STATUSES:
+                raise
+            if end - start <= self.__min_window:
+                raise
+            middle = start + (end - start) // 2
+            first = self.__fetch_window(model_id, key, attrs, start, middle, False)
+            second = self.__fetch_window(model_id, key, attrs, middle, end, last)
+            return self.__merge(first, second)
+        items = result or []
+        if last:
+            return items
+        # end of window belongs to next window
+        results = []
+        for item in items:
+            timestamps = item.get('t', [])
+            count = bisect_left(timestamps, end)
+            if count < len(timestamps):
+                item = { **item, 't': timestamps[:count], 'v': item.get('v', [])[:count] }
+            results.append(item)
+        return results
+
+    def __merge(self, first: List[Any], second: List[Any]) -> List[Any]:
+        results = { item.get('s'): { **item, 't': list(item.get('t', [])), 'v': list(item.get('v', [])) } for item in first }
+        for item in second:
+            result = results.get(item.get('s'))
+            if result is None:
+                results[item.get('s')] = item
+                continue
+            result['t'].extend(item.get('t', []))
+            result['v'].extend(item.get('v', []))
+        return list(results.values())
+
+    def __next_window(self, window: int, items: List[Any]) -> int:
+        count = max((len(item.get('t', [])) for item in items), default=0)
+        if count == 0:
+            result = window * 2
+        else:
+            result = window * self.__max_points // count
+        return max(self.__min_window, min(self.__max_window, result))
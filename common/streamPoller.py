@@ -0,0 +1,174 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple
+
+from .tandemClient import TandemClient
+
+class StreamReading(NamedTuple):
+    """
+    Single value of stream attribute. Timestamp is in milliseconds.
+    """
+
+    key: str
+    attr: str
+    timestamp: int
+    value: Any
+
+class StreamPoller:
+    """
+    Polls streams for new values. Last timestamp seen for each stream attribute is stored in local state file,
+    so only new values are requested - also after restart. Values which were already seen are skipped. If overlap
+    is set then timestamps seen within overlap are stored too, so values which arrive late are returned once.
+    """
+
+    def __init__(self,
+                 client: TandemClient,
+                 model_id: str,
+                 keys: List[str],
+                 state_path: str,
+                 attrs: List[str] | None = None,
+                 interval: float = 60,
+                 lookback: int = 5 * 60 * 1000,
+                 overlap: int = 0,
+                 use_delta: bool = True,
+                 max_workers: int = 4) -> None:
+        """
+        Creates new instance of StreamPoller. interval is time between polls in seconds. lookback is time range
+        (milliseconds) requested for streams without stored state - attributes which lag behind other attributes of
+        the stream by more than lookback are requested separately. overlap (milliseconds) can be used to receive
+        values which arrive late - values older than last value by more than overlap are ignored.
+        """
+
+        self.__client = client
+        self.__model_id = model_id
+        self.__keys = keys
+        self.__state_path = state_path
+        self.__attrs = attrs
+        self.__interval = interval
+        self.__lookback = lookback
+        self.__overlap = overlap
+        self.__use_delta = use_delta
+        self.__max_workers = max_workers
+        self.__lock = threading.Lock()
+        # last timestamp and timestamps seen within overlap for each stream attribute
+        self.__state: Dict[str, Dict[str, Dict[str, Any]]] = self.__load_state()
+
+    def get_cursor(self, key: str) -> int | None:
+        """
+        Returns last timestamp seen for given stream or None if stream wasn't polled yet. If attributes of the stream
+        were updated at different times then the oldest one is returned.
+        """
+
+        with self.__lock:
+            cursors = self.__state.get(key)
+            if not cursors:
+                return None
+            return min(cursor['last'] for cursor in cursors.values())
+
+    def poll(self) -> List[StreamReading]:
+        """
+        Requests new values of all streams and returns them ordered by stream and timestamp. State is
+        stored once values are received.
+        """
+
+        now = round(time.time() * 1000)
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            results = list(executor.map(lambda key: self.__poll_stream(key, now), self.__keys))
+        readings = [reading for result in results for reading in result]
+        if len(readings) > 0:
+            self.__save_state()
+        return readings
+
+    async def readings(self) -> AsyncIterator[StreamReading]:
+        """
+        Returns async iterator of new values. Streams are polled in regular intervals.
+        """
+
+        loop = asyncio.get_running_loop()
+        while True:
+            for reading in await loop.run_in_executor(None, self.poll):
+                yield reading
+            await asyncio.sleep(self.__interval)
+
+    def run(self, callback: Callable[[List[StreamReading]], None], stop_event: threading.Event | None = None) -> None:
+        """
+        Polls streams in regular intervals and calls callback with new values until stop_event is set.
+        """
+
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            readings = self.poll()
+            if len(readings) > 0:
+                callback(readings)
+            stop_event.wait(self.__interval)
+
+    def __load_state(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        if not os.path.exists(self.__state_path):
+            return {}
+        with open(self.__state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        # state can contain timestamps only (without seen values)
+        return {
+            key: { attr: cursor if isinstance(cursor, dict) else { 'last': cursor, 'seen': [] } for attr, cursor in cursors.items() }
+            for key, cursors in state.items()
+        }
+
+    def __poll_stream(self, key: str, now: int) -> List[StreamReading]:
+        with self.__lock:
+            lasts = { attr: cursor['last'] for attr, cursor in self.__state.get(key, {}).items() }
+        items = []
+        if len(lasts) == 0:
+            items.extend(self.__query(key, self.__attrs, now - self.__lookback))
+        else:
+            # attributes which lag behind by more than lookback (i.e. stopped reporting) are requested separately
+            # from their own cursors so they don't extend time range requested for other attributes. They are
+            # processed first so their older values aren't skipped once newer values are seen.
+            newest = max(lasts.values())
+            lagging = [attr for attr, last in lasts.items() if last < newest - self.__lookback]
+            current = min(last for last in lasts.values() if last >= newest - self.__lookback)
+            for attr in lagging:
+                items.extend(self.__query(key, [attr], lasts[attr] - self.__overlap))
+            items.extend(self.__query(key, self.__attrs, current - self.__overlap))
+        results = []
+        with self.__lock:
+            cursors = self.__state.setdefault(key, {})
+            for item in items:
+                attr = item.get('s')
+                cursor = cursors.get(attr)
+                last = cursor['last'] if cursor is not None else None
+                seen = set(cursor['seen']) if cursor is not None else set()
+                for timestamp, value in zip(item.get('t', []), item.get('v', [])):
+                    # skip values which were already returned (from date is inclusive and overlaps) and values
+                    # which are older than overlap
+                    if timestamp in seen or (last is not None and timestamp <= last - self.__overlap):
+                        continue
+                    results.append(StreamReading(key, attr, timestamp, value))
+                    seen.add(timestamp)
+                    if cursor is None:
+                        cursor = { 'last': timestamp, 'seen': [] }
+                        cursors[attr] = cursor
+                    cursor['last'] = max(timestamp, cursor['last'])
+                if cursor is not None:
+                    # only timestamps within overlap can be received again
+                    cursor['seen'] = sorted(t for t in seen if t > cursor['last'] - self.__overlap) if self.__overlap > 0 else []
+        results.sort(key=lambda r: r.timestamp)
+        return results
+
+    def __query(self, key: str, attrs: List[str] | None, from_date: int) -> List[Any]:
+        items = self.__client.query_stream_data(self.__model_id, [key], attrs=attrs, from_date=from_date, use_delta=self.__use_delta)
+        return items or []
+
+    def __save_state(self) -> None:
+        with self.__lock:
+            data = json.dumps(self.__state)
+        # state is replaced at once so it isn't corrupted if process is terminated while writing
+        temp_path = f'{self.__state_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.__state_path)
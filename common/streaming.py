@@ -0,0 +1,76 @@
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+__whitespace = re.compile(r'[ \t\n\r]*')
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Parses JSON array incrementally from chunks of bytes and yields its items one by one.
+    Only the item being parsed is kept in memory, not the whole array.
+    """
+
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    state = {
+        'buffer': '',
+        'pos': 0,
+        'started': False,
+        'finished': False
+    }
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        state['buffer'] = state['buffer'][state['pos']:] + text_decoder.decode(chunk)
+        state['pos'] = 0
+        yield from __parse_items(decoder, state, False)
+        if state['finished']:
+            return
+    state['buffer'] = state['buffer'][state['pos']:] + text_decoder.decode(b'', final=True)
+    state['pos'] = 0
+    yield from __parse_items(decoder, state, True)
+    if not state['finished']:
+        raise ValueError('Unexpected end of JSON array')
+
+def __parse_items(decoder: json.JSONDecoder, state: dict, final: bool) -> Iterator[Any]:
+    buffer = state['buffer']
+    pos = state['pos']
+
+    while True:
+        pos = __whitespace.match(buffer, pos).end()
+        if pos == len(buffer):
+            break
+        if not state['started']:
+            if buffer[pos] != '[':
+                raise ValueError(f'Expected JSON array at position {pos}')
+            state['started'] = True
+            pos += 1
+            continue
+        c = buffer[pos]
+        if c == ']':
+            state['finished'] = True
+            pos += 1
+            break
+        if c == ',':
+            pos += 1
+            continue
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            # item is not complete yet - wait for next chunk
+            break
+        # value at the end of buffer can continue in next chunk (i.e. number)
+        if end == len(buffer) and not final:
+            break
+        # scalar can be only part of value split by chunk boundary (i.e. 2 of 2.5) - it is complete only if
+        # it is followed by separator
+        if not final and not isinstance(item, (dict, list)) and buffer[end] not in ',] \t\n\r':
+            break
+        state['pos'] = end
+        yield item
+        pos = end
+    state['pos'] = pos
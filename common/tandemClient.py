@@ -1,6 +1,9 @@
 import functools
+import threading
+import time
 import requests
-from typing import Any, Callable, Dict, List, TypeVar
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Dict, Iterator, List, Tuple, TypeVar
 import warnings
 
 from .constants import (
@@ -23,16 +26,32 @@ from .constants import (
     ELEMENT_FLAGS_STREAM,
     ELEMENT_FLAGS_SYSTEM,
     ELEMENT_FLAGS_TICKET,
+    EP_ASSETS,
+    EP_ELEMENTS,
+    EP_LEVELS,
+    EP_ROOMS,
+    EP_STREAMS,
+    EP_SYSTEMS,
+    EP_TICKETS,
     MUTATE_ACTIONS_DELETE_ROW,
     MUTATE_ACTIONS_INSERT,
     QC_ELEMENT_FLAGS,
     QC_IS_ASSET,
+    QC_KEY,
     AccessLevel,
     Environment
 )
+from .rateLimiter import ENDPOINT_CLASS_DEFAULT, AdaptiveRateLimiter, get_endpoint_class
+from .retryPolicy import RetryPolicy, RetryStats
+from .schemaIndex import SchemaIndex
+from .streaming import iter_json_array
+from .timeseries import TimeseriesFrame
 
 F = TypeVar('F', bound=Callable[..., Any])
 
+SCAN_KEYS_BATCH_SIZE = 10000
+STREAM_CHUNK_SIZE = 64 * 1024
+
 def non_public_method(func: F) -> F:
     """Decorator to mark methods as non-public and issue a warning when called."""
     @functools.wraps(func)
@@ -43,12 +62,45 @@ def non_public_method(func: F) -> F:
         return func(*args, **kwargs)
     return wrapper  # type: ignore
 
+PARTITIONS_BY_FLAGS = {
+    ELEMENT_FLAGS_LEVEL: EP_LEVELS,
+    ELEMENT_FLAGS_ROOM: EP_ROOMS,
+    ELEMENT_FLAGS_STREAM: EP_STREAMS,
+    ELEMENT_FLAGS_SYSTEM: EP_SYSTEMS,
+    ELEMENT_FLAGS_TICKET: EP_TICKETS
+}
+
+class TandemApiError(Exception):
+    """ Error returned by Tandem API. """
+
+    def __init__(self, status_code: int, text: str) -> None:
+        super().__init__(f'Error while calling Tandem API: {status_code} - {text}')
+        self.status_code = status_code
+        self.text = text
+
 class TandemClient:
     """ A simple wrapper for Tandem Data API """
 
-    def __init__(self, callback: Callable[..., str], region: str | None = None, env: Environment = Environment.PROD) -> None:
+    def __init__(self,
+                 callback: Callable[..., str],
+                 region: str | None = None,
+                 env: Environment = Environment.PROD,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 pool_block: bool = False,
+                 adapter_options: Dict[str, Any] | None = None,
+                 retry_policy: RetryPolicy | None = None,
+                 rate_limiter: AdaptiveRateLimiter | None = None,
+                 timeout: float | None = None) -> None:
         """
         Creates new instance of TandemClient.
+
+        HTTP calls share keep-alive connection pool. pool_connections is number of hosts to keep pools for,
+        pool_maxsize is maximum number of connections per host and pool_block controls if calls wait
+        for free connection when pool is exhausted. adapter_options are passed to HTTPAdapter.
+        Failed calls are retried according to retry_policy. Use RetryPolicy(max_retries=0) to disable retries.
+        If rate_limiter is provided then calls are throttled on client side. Same limiter can be shared by
+        multiple clients. timeout (seconds) limits waiting for response of each call - no limit by default.
         """
 
         base_url = {
@@ -58,13 +110,57 @@ class TandemClient:
         self.__authProvider = callback
         self.__base_url = f'{base_url}/tandem/v1'
         self.__region = region
-        pass
+        self.__adapter_options = {
+            'pool_connections': pool_connections,
+            'pool_maxsize': pool_maxsize,
+            'pool_block': pool_block
+        }
+        if adapter_options is not None:
+            self.__adapter_options.update(adapter_options)
+        self.__session: requests.Session | None = None
+        self.__session_lock = threading.Lock()
+        self.__retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.__retry_stats = RetryStats()
+        self.__rate_limiter = rate_limiter
+        self.__timeout = timeout
+        # flags index is cached per model together with version of the model - it maps element key to element
+        # flags and asset status
+        self.__flags_index: Dict[str, Tuple[Any, Dict[str, Tuple[int | None, bool]]]] = {}
+        self.__flags_index_lock = threading.Lock()
 
     def __enter__(self) -> "TandemClient":
+        self.__get_session()
         return self
     
     def __exit__(self, *args: Any)-> None:
-        pass
+        self.close()
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        """
+        Returns counters of calls and retries.
+        """
+
+        return self.__retry_stats
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """
+        Returns policy used to retry failed calls.
+        """
+
+        return self.__retry_policy
+
+    def close(self) -> None:
+        """
+        Closes pooled connections. The pool is created again on next call.
+        """
+
+        with self.__session_lock:
+            session = self.__session
+            self.__session = None
+        if session is not None:
+            session.close()
 
     def add_facility_user(self, facility_id: str, user_email: str, access_level: AccessLevel) -> None:
         """"
@@ -144,7 +240,11 @@ class TandemClient:
 
         token = self.__authProvider()
         endpoint = f'modeldata/{model_id}/create'
-        response = self.__post(token, endpoint, inputs)
+        try:
+            response = self.__post(token, endpoint, inputs)
+        finally:
+            # index is dropped after request so concurrent scan can't cache state before the change
+            self.invalidate_flags_index(model_id)
         return response
 
     def create_facility(self, group_id: str, settings: Dict[str, Any]) -> Any:
@@ -206,7 +306,10 @@ class TandemClient:
             inputs['muts'].append([ MUTATE_ACTIONS_INSERT, COLUMN_FAMILIES_XREFS, COLUMN_NAMES_ROOMS, room_xref ])
         if level_key is not None:
             inputs['muts'].append([ MUTATE_ACTIONS_INSERT, COLUMN_FAMILIES_REFS, COLUMN_NAMES_LEVEL, level_key ])
-        response = self.__post(token, endpoint, inputs)
+        try:
+            response = self.__post(token, endpoint, inputs)
+        finally:
+            self.invalidate_flags_index(model_id)
         return response.get('key')
 
     @non_public_method
@@ -272,19 +375,21 @@ class TandemClient:
 
         token = self.__authProvider()
         endpoint = f'modeldata/{model_id}/scan'
-        inputs: Dict[str, Any] = {
-            'includeHistory': include_history,
-            'skipArrays': True
-        }
-        if column_families is not None and len(column_families) > 0:
-            inputs['families'] = column_families
-        if columns is not None and len(columns) > 0:
-            inputs['qualifiedColumns'] = columns
-        if element_ids is not None and len(element_ids) > 0:
-            inputs['keys'] = element_ids
-        result = self.__post(token, endpoint, inputs)
+        inputs = self.__scan_inputs(element_ids, column_families, columns, include_history)
+        result = self.__post(token, endpoint, inputs, idempotent=True)
         return result[1:]
     
+    def iter_elements(self, model_id: str, element_ids: List[str] | None = None, column_families: List[str] | None = [ COLUMN_FAMILIES_STANDARD ], columns: List[str] | None = None, include_history: bool = False) -> Iterator[Any]:
+        """
+        Returns iterator of elements for given model. Response is parsed incrementally so only
+        one element is kept in memory at a time.
+        """
+
+        items = self.__scan(model_id, element_ids, column_families, columns, include_history)
+        # first item is version of the model
+        next(items, None)
+        yield from items
+
     def get_facility(self, facility_id: str) -> Any:
         """
         Retuns facility for given facility urn.
@@ -301,7 +406,7 @@ class TandemClient:
 
         token = self.__authProvider()
         endpoint = f'twins/{facility_id}/history'
-        return self.__post(token, endpoint, inputs)
+        return self.__post(token, endpoint, inputs, idempotent=True)
     
     def get_facility_template(self, facility_id: str) -> Any:
         """
@@ -351,28 +456,12 @@ class TandemClient:
         result = self.__get(token, endpoint)
         return result
     
-    def get_levels(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD ]) -> Any:
+    def get_levels(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD ], columns: List[str] | None = None) -> Any:
         """
-        Returns level elements from given model.
+        Returns level elements from given model. If columns are provided then only these columns are returned.
         """
         
-        token = self.__authProvider()
-        endpoint = f'modeldata/{model_id}/scan'
-        inputs = {
-            'families': column_families,
-            'includeHistory': False,
-            'skipArrays': True
-        }
-        data = self.__post(token, endpoint, inputs)
-        results = []
-
-        for elem in data:
-            if not isinstance(elem, dict):
-                continue
-            flags = elem.get(QC_ELEMENT_FLAGS, None)
-            if flags == ELEMENT_FLAGS_LEVEL:
-                results.append(elem)
-        return results
+        return self.__scan_typed(model_id, ELEMENT_FLAGS_LEVEL, column_families, columns)
     
     def get_model(self, model_id: str) -> Any:
         """
@@ -415,7 +504,7 @@ class TandemClient:
             inputs['max'] = max
         if timestamps is not None:
             inputs['timestamps'] = timestamps
-        response = self.__post(token, endpoint, inputs)
+        response = self.__post(token, endpoint, inputs, idempotent=True)
         return response
     
     def get_model_history_between_dates(self, model_id: str, from_date: int, to_date: int, include_changes: bool = True, use_full_keys: bool = True):
@@ -431,7 +520,7 @@ class TandemClient:
             'includeChanges': include_changes,
             'useFullKeys': use_full_keys
         }
-        response = self.__post(token, endpoint, inputs)
+        response = self.__post(token, endpoint, inputs, idempotent=True)
         return response
     
     def get_model_props(self, model_id: str) -> Any:
@@ -443,37 +532,24 @@ class TandemClient:
         endpoint = f'models/{model_id}/props'
         return self.__get(token, endpoint)
 
-    def get_model_schema(self, model_id: str) -> Any:
+    def get_model_schema(self, model_id: str, as_index: bool = False) -> Any:
         """
-        Returns schema for given model URN.
+        Returns schema for given model URN. If as_index is True then schema is returned as SchemaIndex.
         """
 
         token = self.__authProvider()
         endpoint = f'modeldata/{model_id}/schema'
-        return self.__get(token, endpoint)
+        result = self.__get(token, endpoint)
+        if as_index:
+            return SchemaIndex(result)
+        return result
     
-    def get_rooms(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD ]) -> Any:
+    def get_rooms(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD ], columns: List[str] | None = None) -> Any:
         """
-        Returns room elements from given model.
+        Returns room elements from given model. If columns are provided then only these columns are returned.
         """
         
-        token = self.__authProvider()
-        endpoint = f'modeldata/{model_id}/scan'
-        inputs = {
-            'families': column_families,
-            'includeHistory': False,
-            'skipArrays': True
-        }
-        data = self.__post(token, endpoint, inputs)
-        results = []
-
-        for elem in data:
-            if not isinstance(elem, dict):
-                continue
-            flags = elem.get(QC_ELEMENT_FLAGS, None)
-            if flags == ELEMENT_FLAGS_ROOM:
-                results.append(elem)
-        return results
+        return self.__scan_typed(model_id, ELEMENT_FLAGS_ROOM, column_families, columns)
     
     def get_stream_config(self, model_id: str, stream_key: str) -> Any:
         """
@@ -495,9 +571,10 @@ class TandemClient:
         result = self.__get(token, endpoint)
         return result
 
-    def get_stream_data(self, model_id: str, key: str, from_date: int | None = None, to_date: int | None = None) -> Any:
+    def get_stream_data(self, model_id: str, key: str, from_date: int | None = None, to_date: int | None = None, as_frame: bool = False) -> Any:
         """
         Returns data for given stream. It can be used to get data for given time range (from, to).
+        If as_frame is True then data is returned as TimeseriesFrame.
         """
     
         token = self.__authProvider()
@@ -508,6 +585,8 @@ class TandemClient:
         if to_date is not None:
             search_params['to'] = to_date
         result = self.__get(token, endpoint, search_params)
+        if as_frame:
+            return TimeseriesFrame.from_stream_data(key, result)
         return result
     
     def get_stream_last_reading(self, model_id: str, keys: List[str]) -> Any:
@@ -520,7 +599,7 @@ class TandemClient:
         }
         token = self.__authProvider()
         endpoint = f'timeseries/models/{model_id}/streams'
-        result = self.__post(token, endpoint, input)
+        result = self.__post(token, endpoint, input, idempotent=True)
         return result
 
     def get_stream_secrets(self, model_id: str, keys: List[str]) -> Any:
@@ -533,102 +612,39 @@ class TandemClient:
         inputs = {
             'keys': keys
         }
-        result = self.__post(token, endpoint, inputs)
+        result = self.__post(token, endpoint, inputs, idempotent=True)
         return result
     
-    def get_streams(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_REFS, COLUMN_FAMILIES_XREFS ]) -> Any:
+    def get_streams(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_REFS, COLUMN_FAMILIES_XREFS ], columns: List[str] | None = None) -> Any:
         """
-        Returns stream elements from given model.
+        Returns stream elements from given model. If columns are provided then only these columns are returned.
         """
         
-        token = self.__authProvider()
-        endpoint = f'modeldata/{model_id}/scan'
-        inputs = {
-            'families': column_families,
-            'includeHistory': False,
-            'skipArrays': True
-        }
-        data = self.__post(token, endpoint, inputs)
-        results = []
-
-        for elem in data:
-            if not isinstance(elem, dict):
-                continue
-            flags = elem.get(QC_ELEMENT_FLAGS, None)
-            if flags == ELEMENT_FLAGS_STREAM:
-                results.append(elem)
-        return results
+        return self.__scan_typed(model_id, ELEMENT_FLAGS_STREAM, column_families, columns)
     
-    def get_systems(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_REFS, COLUMN_FAMILIES_SYSTEMS ]) -> Any:
+    def get_systems(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_REFS, COLUMN_FAMILIES_SYSTEMS ], columns: List[str] | None = None) -> Any:
         """
-        Returns system elements from given model.
+        Returns system elements from given model. If columns are provided then only these columns are returned.
         """
         
-        token = self.__authProvider()
-        endpoint = f'modeldata/{model_id}/scan'
-        inputs = {
-            'families': column_families,
-            'includeHistory': False,
-            'skipArrays': True
-        }
-        data = self.__post(token, endpoint, inputs)
-        results = []
-
-        for elem in data:
-            if not isinstance(elem, dict):
-                continue
-            flags = elem.get(QC_ELEMENT_FLAGS, None)
-            if flags == ELEMENT_FLAGS_SYSTEM:
-                results.append(elem)
-        return results
+        return self.__scan_typed(model_id, ELEMENT_FLAGS_SYSTEM, column_families, columns)
     
     def get_tagged_assets(self, model_id: str,
                           column_families: List[str] = [ COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_DTPROPERTIES, COLUMN_FAMILIES_REFS ],
-                          include_history: bool = False) -> Any:
+                          include_history: bool = False,
+                          columns: List[str] | None = None) -> Any:
         """
-        Returns list of tagged assets from given model.
+        Returns list of tagged assets from given model. If columns are provided then only these columns are returned.
         """
         
-        token = self.__authProvider()
-        endpoint = f'modeldata/{model_id}/scan'
-        inputs = {
-            'families': column_families,
-            'includeHistory': include_history,
-            'skipArrays': True
-        }
-        data = self.__post(token, endpoint, inputs)
-        results = []
-
-        for elem in data:
-            if not isinstance(elem, dict):
-                continue
-            is_asset = elem.get(QC_IS_ASSET, None)
-            if is_asset:
-                results.append(elem)
-        return results
+        return self.__scan_typed(model_id, None, column_families, columns, include_history)
     
-    def get_tickets(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_REFS,COLUMN_FAMILIES_XREFS ]) -> Any:
+    def get_tickets(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_REFS,COLUMN_FAMILIES_XREFS ], columns: List[str] | None = None) -> Any:
         """
-        Returns ticket elements from given model.
+        Returns ticket elements from given model. If columns are provided then only these columns are returned.
         """
         
-        token = self.__authProvider()
-        endpoint = f'modeldata/{model_id}/scan'
-        inputs = {
-            'families': column_families,
-            'includeHistory': False,
-            'skipArrays': True
-        }
-        data = self.__post(token, endpoint, inputs)
-        results = []
-
-        for elem in data:
-            if not isinstance(elem, dict):
-                continue
-            flags = elem.get(QC_ELEMENT_FLAGS, None)
-            if flags == ELEMENT_FLAGS_TICKET:
-                results.append(elem)
-        return results
+        return self.__scan_typed(model_id, ELEMENT_FLAGS_TICKET, column_families, columns)
     
     def get_views(self, facility_id: str) -> Any:
         """
@@ -640,6 +656,18 @@ class TandemClient:
         result = self.__get(token, endpoint)
         return result
     
+    def invalidate_flags_index(self, model_id: str | None = None) -> None:
+        """
+        Removes cached flags index of given model or of all models. Index is rebuilt on next typed scan. Index is
+        also rebuilt when typed scan detects that version of the model has changed.
+        """
+
+        with self.__flags_index_lock:
+            if model_id is None:
+                self.__flags_index.clear()
+            else:
+                self.__flags_index.pop(model_id, None)
+
     def mutate_elements(self, model_id: str, keys: List[str], mutations, description: str, correlation_id: str | None = None, additional_params: dict | None= None) -> Any:
         """
         Modifies given elements.
@@ -656,12 +684,16 @@ class TandemClient:
             inputs['correlation_id'] = correlation_id
         if additional_params is not None:
             inputs.update(additional_params)
-        result = self.__post(token, endpoint, inputs)
+        try:
+            result = self.__post(token, endpoint, inputs)
+        finally:
+            self.invalidate_flags_index(model_id)
         return result
     
-    def query_stream_data(self, model_id: str, keys: list[str], attrs: list[str] | None = None, from_date: int | None = None, to_date: int | None = None, use_delta: bool = False) -> Any:
+    def query_stream_data(self, model_id: str, keys: list[str], attrs: list[str] | None = None, from_date: int | None = None, to_date: int | None = None, use_delta: bool = False, as_frame: bool = False, retry_policy: RetryPolicy | None = None, timeout: float | None = None) -> Any:
         """
         Returns data for given stream and optionally for given attributes. It can be used to get data for given time range (from, to).
+        If as_frame is True then data is returned as TimeseriesFrame. retry_policy and timeout override settings of the client for this call.
         """
     
         token = self.__authProvider()
@@ -678,7 +710,9 @@ class TandemClient:
         }
         if attrs is not None and len(attrs) > 0:
             inputs['attrs'] = attrs
-        result = self.__post(token, endpoint, inputs, search_params)
+        result = self.__post(token, endpoint, inputs, search_params, idempotent=True, retry_policy=retry_policy, timeout=timeout)
+        if as_frame:
+            return TimeseriesFrame.from_query(keys[0] if len(keys) == 1 else None, result)
         return result
     
     def reset_stream_secrets(self, model_id, stream_ids: List[str], hard_reset: bool = False) -> Any:
@@ -695,6 +729,49 @@ class TandemClient:
         result = self.__post(token, endpoint, inputs)
         return result
     
+    def scan_model_partitioned(self, model_id: str, column_families: List[str] = [ COLUMN_FAMILIES_STANDARD ], include_history: bool = False) -> Dict[str, List[Any]]:
+        """
+        Scans model once and returns its elements grouped by type (levels, rooms, streams, systems, tickets
+        and other elements). Tagged assets are also returned in separate group.
+        """
+
+        # element flags are needed to classify elements
+        if COLUMN_FAMILIES_STANDARD not in column_families:
+            column_families = [ COLUMN_FAMILIES_STANDARD, *column_families ]
+        result: Dict[str, List[Any]] = {
+            EP_ASSETS: [],
+            EP_ELEMENTS: [],
+            EP_LEVELS: [],
+            EP_ROOMS: [],
+            EP_STREAMS: [],
+            EP_SYSTEMS: [],
+            EP_TICKETS: []
+        }
+        index = {}
+        items = self.__scan(model_id, None, column_families, None, include_history)
+        version = next(items, None)
+
+        for elem in items:
+            if not isinstance(elem, dict):
+                continue
+            flags = elem.get(QC_ELEMENT_FLAGS, None)
+            is_asset = elem.get(QC_IS_ASSET, False)
+            # in case of history values are returned as list of values and timestamps
+            if isinstance(flags, list):
+                flags = flags[0] if len(flags) > 0 else None
+            if isinstance(is_asset, list):
+                is_asset = is_asset[0] if len(is_asset) > 0 else False
+            is_asset = bool(is_asset)
+            result[PARTITIONS_BY_FLAGS.get(flags, EP_ELEMENTS)].append(elem)
+            if is_asset:
+                result[EP_ASSETS].append(elem)
+            index[elem.get(QC_KEY)] = (flags, is_asset)
+        # full scan contains all data needed for flags index
+        if len(index) > 0:
+            with self.__flags_index_lock:
+                self.__flags_index[model_id] = (version, index)
+        return result
+
     def save_document_content(self, url: str, file_path: str) -> None:
         """"
         Downloads document to local file.
@@ -704,7 +781,7 @@ class TandemClient:
         headers = {
             'Authorization': f'Bearer {token}'
         }
-        response = requests.get(url, headers=headers)
+        response = self.__send('GET', url, True, headers=headers)
         if not response.ok:
             raise Exception(f'Error while downloading document: {response.status_code} - {response.text}')
         with open(file_path, 'wb') as file:
@@ -771,12 +848,42 @@ class TandemClient:
         if (self.__region is not None):
             headers['Region'] = self.__region
         url = f'{self.__base_url}/{endpoint}'
-        response = requests.get(url, headers=headers, params=params)
+        response = self.__send('GET', url, True, headers=headers, params=params)
         if not response.ok:
-            raise Exception(f'Error while calling Tandem API: {response.status_code} - {response.text}')
+            raise TandemApiError(response.status_code, response.text)
         return response.json()
     
-    def __patch(self, token: str, endpoint: str, data: Any | None = None, params: Dict[str, Any] | None = None) -> Any:
+    def __get_flags_index(self, model_id: str) -> Tuple[Any, Dict[str, Tuple[int | None, bool]]]:
+        with self.__flags_index_lock:
+            item = self.__flags_index.get(model_id)
+        if item is not None:
+            return item
+        # scan only columns which are needed to classify elements
+        index = {}
+        items = self.__scan(model_id, None, None, [ QC_ELEMENT_FLAGS, QC_IS_ASSET ], False)
+        version = next(items, None)
+        for elem in items:
+            if not isinstance(elem, dict):
+                continue
+            index[elem.get(QC_KEY)] = (elem.get(QC_ELEMENT_FLAGS, None), bool(elem.get(QC_IS_ASSET, False)))
+        # index of empty model isn't cached - there is no element which can be used to check version of the model
+        if len(index) > 0:
+            with self.__flags_index_lock:
+                self.__flags_index[model_id] = (version, index)
+        return version, index
+
+    def __get_session(self) -> requests.Session:
+        # session is created once even if first calls are made from multiple threads
+        with self.__session_lock:
+            if self.__session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(**self.__adapter_options)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self.__session = session
+            return self.__session
+
+    def __patch(self, token: str, endpoint: str, data: Any | None = None, params: Dict[str, Any] | None = None, idempotent: bool = False) -> Any:
         headers = {
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json',
@@ -784,14 +891,14 @@ class TandemClient:
         if (self.__region is not None):
             headers['Region'] = self.__region
         url = f'{self.__base_url}/{endpoint}'
-        response = requests.patch(url, headers=headers, json=data, params=params)
+        response = self.__send('PATCH', url, idempotent, headers=headers, json=data, params=params)
         if response.ok:
             if len(response.content) == 0:
                 return None
             return response.json()
-        raise Exception(f'Error while calling Tandem API: {response.status_code} - {response.text}')
+        raise TandemApiError(response.status_code, response.text)
     
-    def __post(self, token: str, endpoint: str, data: Any | None = None, params: Dict[str, Any] | None = None) -> Any:
+    def __post(self, token: str, endpoint: str, data: Any | None = None, params: Dict[str, Any] | None = None, idempotent: bool = False, retry_policy: RetryPolicy | None = None, timeout: float | None = None) -> Any:
         headers = {
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json',
@@ -799,14 +906,67 @@ class TandemClient:
         if (self.__region is not None):
             headers['Region'] = self.__region
         url = f'{self.__base_url}/{endpoint}'
-        response = requests.post(url, headers=headers, json=data, params=params)
+        response = self.__send('POST', url, idempotent, retry_policy, headers=headers, json=data, params=params, timeout=timeout)
         if response.ok:
             if len(response.content) == 0:
                 return None
             return response.json()
-        raise Exception(f'Error while calling Tandem API: {response.status_code} - {response.text}')
+        raise TandemApiError(response.status_code, response.text)
+
+    def __post_stream(self, token: str, endpoint: str, data: Any | None = None, params: Dict[str, Any] | None = None) -> Iterator[Any]:
+        headers = {
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json',
+        }
+        if (self.__region is not None):
+            headers['Region'] = self.__region
+        url = f'{self.__base_url}/{endpoint}'
+        # scan is read operation so it can be retried
+        with self.__send('POST', url, True, headers=headers, json=data, params=params, stream=True) as response:
+            if not response.ok:
+                raise TandemApiError(response.status_code, response.text)
+            yield from iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+
+    def __send(self, method: str, url: str, idempotent: bool, retry_policy: RetryPolicy | None = None, **kwargs: Any) -> requests.Response:
+        policy = retry_policy if retry_policy is not None else self.__retry_policy
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.__timeout
+        attempt = 0
+        endpoint_class = ENDPOINT_CLASS_DEFAULT
+        if url.startswith(self.__base_url):
+            endpoint_class = get_endpoint_class(url[len(self.__base_url) + 1:])
+
+        while True:
+            retry_after = None
+            if self.__rate_limiter is not None:
+                self.__rate_limiter.acquire(endpoint_class)
+            try:
+                response = self.__get_session().request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if (isinstance(e, requests.Timeout) and not policy.retry_timeouts) or not policy.should_retry(attempt, None, idempotent):
+                    self.__retry_stats.record_call(attempt, True)
+                    raise
+                status_code = None
+            else:
+                status_code = response.status_code
+                if self.__rate_limiter is not None:
+                    if status_code == 429:
+                        self.__rate_limiter.on_throttle(endpoint_class)
+                    elif response.ok:
+                        self.__rate_limiter.on_success(endpoint_class)
+                if response.ok or not policy.should_retry(attempt, status_code, idempotent):
+                    self.__retry_stats.record_call(attempt, not response.ok)
+                    return response
+                retry_after = response.headers.get('Retry-After')
+                response.close()
+            delay = policy.get_delay(attempt, retry_after)
+            attempt += 1
+            self.__retry_stats.record_retry(status_code)
+            if policy.on_retry is not None:
+                policy.on_retry(method, url, attempt, status_code, delay)
+            time.sleep(delay)
 
-    def __put(self, token: str, endpoint: str, data: Any | None = None, params: Dict[str, Any] | None = None) -> Any:
+    def __put(self, token: str, endpoint: str, data: Any | None = None, params: Dict[str, Any] | None = None, idempotent: bool = True) -> Any:
         headers = {
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json',
@@ -814,9 +974,66 @@ class TandemClient:
         if (self.__region is not None):
             headers['Region'] = self.__region
         url = f'{self.__base_url}/{endpoint}'
-        response = requests.put(url, headers=headers, json=data, params=params)
+        response = self.__send('PUT', url, idempotent, headers=headers, json=data, params=params)
         if response.ok:
             if len(response.content) == 0:
                 return None
             return response.json()
-        raise Exception(f'Error while calling Tandem API: {response.status_code} - {response.text}')
+        raise TandemApiError(response.status_code, response.text)
+
+    def __scan_inputs(self, element_ids: List[str] | None = None, column_families: List[str] | None = None, columns: List[str] | None = None, include_history: bool = False) -> Dict[str, Any]:
+        inputs: Dict[str, Any] = {
+            'includeHistory': include_history,
+            'skipArrays': True
+        }
+        if column_families is not None and len(column_families) > 0:
+            inputs['families'] = column_families
+        if columns is not None and len(columns) > 0:
+            inputs['qualifiedColumns'] = columns
+        if element_ids is not None and len(element_ids) > 0:
+            inputs['keys'] = element_ids
+        return inputs
+
+    def __scan(self, model_id: str, element_ids: List[str] | None, column_families: List[str] | None, columns: List[str] | None, include_history: bool) -> Iterator[Any]:
+        # returns all items of the scan - first item is version of the model
+        token = self.__authProvider()
+        endpoint = f'modeldata/{model_id}/scan'
+        inputs = self.__scan_inputs(element_ids, column_families, columns, include_history)
+        return self.__post_stream(token, endpoint, inputs)
+
+    def __scan_keys(self, model_id: str, keys: List[str], column_families: List[str] | None = None, columns: List[str] | None = None, include_history: bool = False) -> Tuple[List[Any], List[Any]]:
+        # request only selected rows. If columns are specified then column families are not needed.
+        # Returns elements and versions of the model returned by each batch.
+        if columns is not None and len(columns) > 0:
+            column_families = None
+        elements = []
+        versions = []
+        for i in range(0, len(keys), SCAN_KEYS_BATCH_SIZE):
+            batch = keys[i:i + SCAN_KEYS_BATCH_SIZE]
+            items = self.__scan(model_id, batch, column_families, columns, include_history)
+            versions.append(next(items, None))
+            elements.extend(elem for elem in items if isinstance(elem, dict))
+        return elements, versions
+
+    def __scan_typed(self, model_id: str, element_flags: int | None, column_families: List[str] | None, columns: List[str] | None, include_history: bool = False) -> List[Any]:
+        # returns elements with given flags (tagged assets if element_flags is None). Keys are taken from cached flags
+        # index - if version of the model returned by keyed scan differs (model was modified i.e. by other client)
+        # then index is rebuilt and elements are requested again.
+        elements: List[Any] = []
+        for _ in range(2):
+            version, index = self.__get_flags_index(model_id)
+            if element_flags is None:
+                keys = [key for key, (_, is_asset) in index.items() if is_asset]
+            else:
+                keys = [key for key, (flags, _) in index.items() if flags == element_flags]
+            if len(keys) > 0:
+                elements, versions = self.__scan_keys(model_id, keys, column_families, columns, include_history)
+            elif len(index) > 0:
+                # nothing to request - single element is requested to check version of the model
+                elements, versions = [], self.__scan_keys(model_id, [next(iter(index))], None, [ QC_ELEMENT_FLAGS ])[1]
+            else:
+                return []
+            if all(v == version for v in versions):
+                break
+            self.invalidate_flags_index(model_id)
+        return elements
\ No newline at end of file
@@ -0,0 +1,138 @@
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+INT32_MIN = np.iinfo(np.int32).min
+INT32_MAX = np.iinfo(np.int32).max
+
+class TimeseriesFrame:
+    """
+    Columnar representation of stream data. Each series is identified by (stream key, attribute id) and consists
+    of array of timestamps (int64, milliseconds) and array of values. Integer values (i.e. discrete properties)
+    are stored as int32, other values as float64. Timestamps of each series are sorted.
+    """
+
+    def __init__(self, series: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] | None = None) -> None:
+        """
+        Creates new instance of TimeseriesFrame from map of (key, attribute) to (timestamps, values).
+        """
+
+        self.__series: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+        if series is not None:
+            for (key, attr), (timestamps, values) in series.items():
+                self.__series[(key, attr)] = self.__sort(np.asarray(timestamps, dtype=np.int64), self.__to_values(values))
+
+    def __contains__(self, item: object) -> bool:
+        return item in self.__series
+
+    def __getitem__(self, item: Tuple[str, str]) -> Tuple[np.ndarray, np.ndarray]:
+        return self.__series[item]
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return iter(self.__series)
+
+    def __len__(self) -> int:
+        return len(self.__series)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Any]) -> "TimeseriesFrame":
+        """
+        Creates frame from data chunks returned by StreamDataFetcher. Chunks of each stream are expected
+        to be in timestamp order.
+        """
+
+        parts: Dict[Tuple[str, str], Tuple[List[np.ndarray], List[np.ndarray]]] = {}
+        for chunk in chunks:
+            for item in chunk.items:
+                timestamps, values = parts.setdefault((item.get('k', chunk.key), item.get('s')), ([], []))
+                timestamps.append(np.asarray(item.get('t', []), dtype=np.int64))
+                values.append(cls.__to_values(item.get('v', [])))
+        result = cls()
+        for id, (timestamps, values) in parts.items():
+            result.__series[id] = (np.concatenate(timestamps), cls.__merge_values(values))
+        return result
+
+    @classmethod
+    def from_query(cls, key: str | None, items: List[Any] | None) -> "TimeseriesFrame":
+        """
+        Creates frame from response of query_stream_data. key is used for items which don't contain stream key.
+        If key is None (i.e. data of multiple streams) then each item has to contain stream key.
+        """
+
+        result = cls()
+        for item in items or []:
+            item_key = item.get('k', key)
+            if item_key is None:
+                raise ValueError('Unable to identify stream of the data - query single stream or use response with stream keys')
+            id = (item_key, item.get('s'))
+            result.__series[id] = cls.__sort(np.asarray(item.get('t', []), dtype=np.int64), cls.__to_values(item.get('v', [])))
+        return result
+
+    @classmethod
+    def from_stream_data(cls, key: str, data: Dict[str, Dict[str, Any]] | None) -> "TimeseriesFrame":
+        """
+        Creates frame from response of get_stream_data (map of attribute to map of timestamp to value).
+        """
+
+        result = cls()
+        for attr, values in (data or {}).items():
+            timestamps = np.fromiter(values.keys(), dtype=np.int64, count=len(values))
+            result.__series[(key, attr)] = cls.__sort(timestamps, cls.__to_values(list(values.values())))
+        return result
+
+    def get(self, key: str, attr: str) -> Tuple[np.ndarray, np.ndarray] | None:
+        """
+        Returns (timestamps, values) of given stream and attribute or None if series doesn't exist.
+        """
+
+        return self.__series.get((key, attr))
+
+    def pivot(self, resolution: int = 1) -> Tuple[np.ndarray, List[Tuple[str, str]], np.ndarray]:
+        """
+        Returns table with one row per timestamp and one column per series as (timestamps, columns, values).
+        Timestamps are rounded down to resolution (milliseconds) - if there are multiple values of series
+        within same row then last one is used. Missing values are NaN.
+        """
+
+        columns = list(self.__series.keys())
+        if len(columns) == 0:
+            return np.empty(0, dtype=np.int64), columns, np.empty((0, 0), dtype=np.float64)
+        buckets = [timestamps // resolution * resolution for timestamps, _ in self.__series.values()]
+        timestamps = np.unique(np.concatenate(buckets))
+        result = np.full((len(timestamps), len(columns)), np.nan, dtype=np.float64)
+        for i, (bucket, (_, values)) in enumerate(zip(buckets, self.__series.values())):
+            # empty series stays NaN
+            if len(bucket) == 0:
+                continue
+            rows = np.searchsorted(timestamps, bucket)
+            # keep last value of each row - timestamps are sorted
+            last = np.append(rows[1:] != rows[:-1], True)
+            result[rows[last], i] = values[last]
+        return timestamps, columns, result
+
+    def point_count(self) -> int:
+        """
+        Returns total number of values.
+        """
+
+        return sum(len(timestamps) for timestamps, _ in self.__series.values())
+
+    @staticmethod
+    def __merge_values(values: List[np.ndarray]) -> np.ndarray:
+        # int32 parts are upcasted if any part contains float values
+        return np.concatenate(values) if len(values) > 0 else np.empty(0, dtype=np.float64)
+
+    @staticmethod
+    def __sort(timestamps: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if len(timestamps) > 1 and np.any(timestamps[1:] < timestamps[:-1]):
+            order = np.argsort(timestamps, kind='stable')
+            return timestamps[order], values[order]
+        return timestamps, values
+
+    @staticmethod
+    def __to_values(values: Any) -> np.ndarray:
+        result = np.asarray(values)
+        if result.dtype.kind in 'iub' and len(result) > 0 and result.min() >= INT32_MIN and result.max() <= INT32_MAX:
+            return result.astype(np.int32)
+        # missing values (None) are converted to NaN
+        return np.asarray(values, dtype=np.float64)
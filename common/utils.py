@@ -1,5 +1,5 @@
 import base64
-from typing import Any
+from typing import Any, Dict, Iterable, List, Tuple
 
 from .constants import (
     ELEMENT_FLAGS_ALL_LOGICAL_MASK,
@@ -8,6 +8,66 @@ from .constants import (
 )
 from .encoding import __make_web_safe
 
+class ClassificationMatcher:
+    """
+    Matches classification against set of classification filters. Filters are normalized once and stored
+    in prefix tree so each classification is resolved by single walk of the tree. Matching rules are
+    same as in match_classification.
+    """
+
+    def __init__(self, filters: Iterable[Tuple[str, Any]] | None = None) -> None:
+        """
+        Creates new instance of ClassificationMatcher. filters is list of (filter, value) tuples.
+        """
+
+        self.__root: Dict[Any, Any] = {}
+        self.__order: Dict[int, int] = {}
+        if filters is not None:
+            for classification_filter, value in filters:
+                self.add(classification_filter, value)
+
+    @classmethod
+    def from_parameters(cls, parameters: Iterable[Any], filter_name: str) -> "ClassificationMatcher":
+        """
+        Creates matcher from template parameters using given application filter (i.e. userClass or tandemCategory).
+        """
+
+        matcher = cls()
+        for parameter in parameters:
+            for classification_filter in parameter.get('applicationFilters', {}).get(filter_name, {}):
+                matcher.add(classification_filter, parameter)
+        return matcher
+
+    def add(self, classification_filter: str, value: Any) -> None:
+        """
+        Adds filter with associated value.
+        """
+
+        key = normalize_classification_filter(classification_filter)
+        if len(key) == 0:
+            return
+        self.__order.setdefault(id(value), len(self.__order))
+        node = self.__root
+        for c in key:
+            node = node.setdefault(c, {})
+        node.setdefault(None, []).append(value)
+
+    def match(self, classification: str) -> List[Any]:
+        """
+        Returns values of all filters matching given classification. Values are returned in order
+        in which they were added.
+        """
+
+        results = {}
+        node = self.__root
+        for c in normalize_classification(classification):
+            node = node.get(c)
+            if node is None:
+                break
+            for value in node.get(None, []):
+                results[id(value)] = value
+        return sorted(results.values(), key=lambda v: self.__order[id(v)])
+
 def get_default_model(facility_id: str, facility: Any) -> Any | None:
     """
     Returns default model for given facility.
@@ -73,6 +133,31 @@ def match_classification(a: str, b: str) -> bool:
             b_c = b[b_i]
     return b_i == b_len
 
+def normalize_classification(classification: str) -> str:
+    """
+    Returns characters of classification which are used for matching. Separators are removed.
+    """
+
+    if len(classification) == 0:
+        return ''
+    return classification[0] + ''.join(c for c in classification[1:] if c.isalnum())
+
+def normalize_classification_filter(classification_filter: str) -> str:
+    """
+    Returns characters of classification filter which are used for matching. Trailing zero groups
+    (i.e. ' 00' or '.00') and separators are removed.
+    """
+
+    b_len = len(classification_filter)
+    while b_len >= 3 and classification_filter[b_len - 1] == '0' and classification_filter[b_len - 2] == '0':
+        c = classification_filter[b_len - 3]
+
+        if c == ' ' or c == '.':
+            b_len -= 3
+        else:
+            break
+    return normalize_classification(classification_filter[:b_len])
+
 def system_class_to_list(flags:int) -> list[str]:
     """
     Converts endcoded system class flags to array of class names.
@@ -0,0 +1,40 @@
+"""
+This example demonstrates how to scan all models of the facility in parallel using AsyncTandemClient.
+
+It uses 2-legged authentication - this requires that application is added to facility as service.
+"""
+import asyncio
+
+from common.asyncTandemClient import AsyncTandemClient
+from common.auth import TokenProvider
+from common.constants import (
+    QC_NAME,
+    QC_ONAME
+)
+
+# update values below according to your environment
+APS_CLIENT_ID = 'YOUR_CLIENT_ID'
+APS_CLIENT_SECRET = 'YOUR_CLIENT_SECRET'
+FACILITY_URN = 'YOUR_FACILITY_URN'
+
+async def main():
+    # Start
+    # STEP 1 - create token provider. It caches 2-legged token and refreshes it before it expires
+    token_provider = TokenProvider(APS_CLIENT_ID, APS_CLIENT_SECRET, ['data:read'])
+    # STEP 2 - create client. max_concurrency limits number of requests running at the same time
+    async with AsyncTandemClient(token_provider, max_concurrency=8) as client:
+        facility = await client.get_facility(FACILITY_URN)
+        links = facility.get('links', [])
+        # STEP 3 - scan all models at once. Results are returned in same order as links.
+        results = await asyncio.gather(*(client.get_elements(l.get('modelId')) for l in links))
+        # STEP 4 - print out elements of each model
+        for l, elements in zip(links, results):
+            model_label = l.get('label', None) or 'Default'
+            print(f'Model: {model_label} ({len(elements)})')
+            for element in elements:
+                name = element.get(QC_ONAME) or element.get(QC_NAME)
+                print(f'  {name}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -17,7 +17,7 @@ from common.constants import (
     QC_OTANDEM_CATEGORY
 )
 
-from common.utils import match_classification
+from common.utils import ClassificationMatcher
 
 # update values below according to your environment
 APS_CLIENT_ID = 'YOUR_CLIENT_ID'
@@ -37,33 +37,28 @@ def main():
         if pset is None:
             print(f'No parameter set found for template: {template.get("name")}')
             return
+        # prepare matchers so filters are not parsed again for each element
+        class_matcher = ClassificationMatcher.from_parameters(pset.get('parameters', []), 'userClass')
+        category_matcher = ClassificationMatcher.from_parameters(pset.get('parameters', []), 'tandemCategory')
         # STEP 3 - iterate through facility models and process elements
         element_count = 0
 
         for l in facility.get('links'):
             model_id = l.get('modelId')
             # STEP 3 - get schema
-            schema = client.get_model_schema(model_id)
-            # STEP 4 - get elements and process one by one
-            elements = client.get_elements(model_id, column_families=[COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_DTPROPERTIES])
-            for element in elements:
+            schema = client.get_model_schema(model_id, as_index=True)
+            # STEP 4 - get elements and process one by one. Elements are parsed as they arrive so whole model
+            # is not loaded into memory
+            for element in client.iter_elements(model_id, column_families=[COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_DTPROPERTIES]):
                 name = element.get(QC_ONAME) or element.get(QC_NAME)
                 # STEP 5 - find parameters related to classification or Tandem category
                 classification = element.get(QC_OCLASSIFICATION) or element.get(QC_CLASSIFICATION)
                 category = element.get(QC_OTANDEM_CATEGORY) or element.get(QC_TANDEM_CATEGORY)
                 class_parameters = None
                 if classification is not None:
-                    class_parameters = [
-                        item
-                        for item in pset.get('parameters', [])
-                        if any(match_classification(classification, c) for c in item.get('applicationFilters', {}).get('userClass', {}))
-                    ]
+                    class_parameters = class_matcher.match(classification)
                 elif category is not None:
-                    class_parameters = [
-                        item
-                        for item in pset.get('parameters', [])
-                        if any(match_classification(category, c) for c in item.get('applicationFilters', {}).get('tandemCategory', {}))
-                    ]
+                    class_parameters = category_matcher.match(category)
                 if class_parameters is None or len(class_parameters) == 0:
                     continue
                 # STEP 6 - check parameters with empty value
@@ -71,7 +66,7 @@ def main():
 
                 print(f'Processing element: {name}')
                 for class_parameter in class_parameters:
-                    parameter_def = next((a for a in schema.get('attributes') if a.get('category') == class_parameter.get('category') and a.get('name') == class_parameter.get('name')), None)
+                    parameter_def = schema.find(class_parameter.get('category'), class_parameter.get('name'))
                     if parameter_def is None:
                         continue
                     # parameter can be either missing or be empty string - depends on type
@@ -7,6 +7,10 @@ It uses 2-legged authentication - this requires that application is added to fac
 from common.auth import create_token
 from common.tandemClient import TandemClient
 from common.constants import (
+    COLUMN_FAMILIES_REFS,
+    COLUMN_FAMILIES_STANDARD,
+    EP_ASSETS,
+    EP_LEVELS,
     QC_KEY,
     QC_LEVEL,
     QC_NAME
@@ -28,8 +32,10 @@ def main():
         # STEP 3 - iterate through facility models
         for l in facility.get('links'):
             model_id = l.get('modelId')
-            levels = client.get_levels(model_id)
-            assets = client.get_tagged_assets(model_id)
+            # scan model once and get both levels and assets
+            partitions = client.scan_model_partitioned(model_id, [ COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_REFS ])
+            levels = partitions[EP_LEVELS]
+            assets = partitions[EP_ASSETS]
             # STEP 4 - iterate through levels
             for level in levels:
                 print(f'{level.get(QC_NAME)}')
@@ -41,7 +41,7 @@ def main():
                 model_label = 'Default'
             print(f'Model: {model_label}')
             # STEP 4 - get schema, assets and history
-            schema = client.get_model_schema(model_id)
+            schema = client.get_model_schema(model_id, as_index=True)
             assets = client.get_tagged_assets(model_id,
                                               column_families=[COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_DTPROPERTIES],
                                               include_history=True)
@@ -65,7 +65,7 @@ def main():
                     # STEP 6 - iterate through properties of asset and find those that changed at this timestamp
                     # when history is requested, each property contains list of values and timestamps
                     for prop_id in asset:
-                        prop_def = next((p for p in schema.get('attributes', []) if p.get('id', None) == prop_id), None)
+                        prop_def = schema.get(prop_id)
                         if prop_def is None:
                             continue
                         prop = asset.get(prop_id, None)
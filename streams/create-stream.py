@@ -9,14 +9,14 @@ to facility as service.
 from common.auth import create_token
 from common.tandemClient import TandemClient
 from common.constants import (
-    COLUMN_FAMILIES_REFS,
-    COLUMN_FAMILIES_STANDARD,
+    ELEMENT_FLAGS_ROOM,
     QC_ELEMENT_FLAGS,
     QC_KEY,
     QC_LEVEL,
     QC_NAME
 )
 from common.encoding import to_full_key, to_xref_key
+from common.facilityScanner import FacilityScanner
 from common.utils import get_default_model, is_logical_element
 
 # update values below according to your environment
@@ -46,19 +46,17 @@ def main():
         uniformat_class_id = 'D7070' # this refers to Electronic Monitoring and Control
         category_id = 5031 # this refers to IoT Connections category
         classification = CLASSIFICATION_ID
-        # iterate through rooms
+        # scan models in parallel and stop once room is found. Level column is requested because we want to know related level
         target_room = None
         target_room_model_id = None
-
-        for l in facility.get('links'):
-            model_id = l.get('modelId')
-            # we need to query for refs because we want to know related level
-            rooms = client.get_rooms(model_id, [ COLUMN_FAMILIES_STANDARD, COLUMN_FAMILIES_REFS ])
-            room = next((r for r in rooms if r.get(QC_NAME) == room_name), None)
-            if room is not None:
-                target_room = room
-                target_room_model_id = model_id.replace('urn:adsk.dtm:', '')
-                break
+        scanner = FacilityScanner(client)
+        results = scanner.find_elements(facility,
+                                        lambda e: e.get(QC_ELEMENT_FLAGS) == ELEMENT_FLAGS_ROOM and e.get(QC_NAME) == room_name,
+                                        columns=[QC_NAME, QC_ELEMENT_FLAGS, QC_LEVEL],
+                                        limit=1)
+        if len(results) > 0:
+            model_id, target_room = results[0]
+            target_room_model_id = model_id.replace('urn:adsk.dtm:', '')
         if target_room is None or target_room_model_id is None:
             print(f'Room {room_name} not found')
             return
@@ -1,7 +1,7 @@
 """
 This example demonstrates how to export time-series stream data from given facility to a
-CSV file using pandas. It queries sensor/parameter data over a date range and formats it
-with human-readable timestamps.
+CSV file. It queries sensor/parameter data over a date range by time windows and writes it
+incrementally with human-readable timestamps.
 
 Prerequisites:
 - Your APS application must be added to the facility as a service
@@ -14,7 +14,6 @@ Output:
 
 """
 from datetime import datetime, timezone
-import pandas as pd
 
 from common.auth import create_token
 from common.constants import (
@@ -23,6 +22,8 @@ from common.constants import (
     QC_ONAME
 )
 from common.encoding import to_short_key
+from common.streamExport import export_stream_data
+from common.streamFetcher import StreamDataFetcher
 from common.tandemClient import TandemClient
 from common.utils import get_default_model
 
@@ -59,9 +60,10 @@ def main():
         stream_configs = client.get_stream_configs(default_model_id)
         # STEP 4 - Find streams that have the target parameter configured
         # Iterate through stream configurations and collect:
-        # - stream IDs (elements with sensors/data)
+        # - stream IDs (elements with sensors/data) and parameters configured for each stream
         # - property definitions for the parameter we want to export
         stream_ids = set()
+        stream_props: dict[str, list[str]] = {}
         prop_defs: dict[str, dict] = {}
 
         for stream_config in stream_configs:
@@ -78,6 +80,7 @@ def main():
                 if prop_def.get('name') == PARAMETER_NAME:
                     prop_defs[prop_id] = prop_def
                     stream_ids.add(stream_config.get('elementId'))
+                    stream_props.setdefault(stream_config.get('elementId'), []).append(prop_id)
         if len(stream_ids) == 0:
             print(f'Warning: No streams found with parameter "{PARAMETER_NAME}"')
             return
@@ -92,61 +95,38 @@ def main():
             .replace(hour=23, minute=59, second=59, tzinfo=timezone.utc)
             .timestamp() * 1000
         )
-        # STEP 6 - query stream data for selected stream IDs, collect values in a dictionary (key = timestamp, value = dict of column name to value)
-        rows_by_timestamp: dict[int, dict[str, float]] = {}
+        # STEP 6 - prepare names of exported streams
+        stream_names: dict[str, str] = {}
 
         print(f'Streams found: {len(stream_ids)}')
+        # STEP 7 - find streams to get stream name for each stream ID
         for stream_id in stream_ids:
-            prop_ids = prop_defs.keys()
-            stream_data = client.query_stream_data(default_model_id,
-                                                   [stream_id],
-                                                   attrs=list(prop_ids),
-                                                   from_date=start_date,
-                                                   to_date=end_date)
-            if len(stream_data) == 0:
-                continue
-            # STEP 7 - find stream to get stream name for the current stream ID
             stream_key = to_short_key(stream_id)
             stream = next((s for s in streams if s.get(QC_KEY) == stream_key), None)
             if not stream:
                 continue
-            stream_name = stream.get(QC_ONAME) or stream.get(QC_NAME)
-            print(f'Processing: {stream_name}')
-            count = 0
-
-            for item in stream_data:
-                prop_id = item.get('s', None)
-                if prop_id not in prop_defs:
-                    continue
-                param_name = prop_defs[prop_id].get('name') or prop_id
-                column_name = f'{stream_name} - {param_name}'
-                timestamps = item.get('t', [])
-                values = item.get('v', [])
-                count += len(values)
-                for timestamp, value in zip(timestamps, values):
-                    # returned timestamps are in milliseconds, group values by second to avoid having
-                    # too many rows in the output (you can adjust this as needed)
-                    row = rows_by_timestamp.setdefault(timestamp // 1000, {})
-                    row[column_name] = value
-            print(f'  Total values: {count}')
-        # STEP 8 - export to CSV file using pandas. Timestamps are converted to human-readable format in the 'timestamp' column.
+            stream_names[stream_id] = stream.get(QC_ONAME) or stream.get(QC_NAME)
+        # STEP 8 - export to CSV file. Data is fetched by time windows and written incrementally so memory use depends
+        # on window size, not on date range. Returned timestamps are in milliseconds, values are grouped by second to avoid
+        # having too many rows in the output (you can adjust this as needed). Use .parquet extension to export to Parquet
+        # (requires pyarrow).
         # Output format:
         #   timestamp,            Sensor A - Temperature, Sensor B - Temperature
         #   2026-01-01 00:00:00,  20.4,                   21.3
         #   2026-01-01 01:00:00,  20.6,
-        if rows_by_timestamp:
-            df = pd.DataFrame.from_dict(rows_by_timestamp, orient='index')
-            df.index.name = 'timestamp_s'
-            df = df.sort_index()
-            # Convert timestamps to human-readable format and insert as a new column
-            df.insert(
-                0,
-                'timestamp',
-                pd.to_datetime(df.index, unit='s', utc=True).strftime('%Y-%m-%d %H:%M:%S')
-            )
-            df = df.reset_index(drop=True)
-            df.to_csv(OUTPUT_CSV, index=False)
-            print(f'Exported stream data to {OUTPUT_CSV}')
+        # only parameters configured for the stream are exported
+        columns = {}
+
+        for stream_id, stream_name in stream_names.items():
+            for prop_id in stream_props.get(stream_id, []):
+                if prop_id not in prop_defs:
+                    continue
+                param_name = prop_defs[prop_id].get('name') or prop_id
+                columns[(stream_id, prop_id)] = f'{stream_name} - {param_name}'
+        fetcher = StreamDataFetcher(client)
+        row_count = export_stream_data(fetcher, default_model_id, columns, start_date, end_date, OUTPUT_CSV, resolution=1000)
+        if row_count > 0:
+            print(f'Exported {row_count} rows of stream data to {OUTPUT_CSV}')
         else:
             print('No stream data found for the selected date range.')
 
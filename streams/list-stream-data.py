@@ -35,7 +35,7 @@ def main():
             raise Exception('Default model not found')
         default_model_id = default_model.get('modelId')
         # STEP 3 - get schema
-        schema = client.get_model_schema(default_model_id)
+        schema = client.get_model_schema(default_model_id, as_index=True)
         # STEP 4 - calculate dates (from, to)
         from_date = round(time() * 1000) - OFFSET_DAYS * 24 * 60 * 60 * 1000
         to_date = round(time() * 1000)
@@ -48,15 +48,14 @@ def main():
             print(f'{name}')
             stream_data = client.get_stream_data(default_model_id, key, from_date, to_date)
             for i in stream_data:
-                prop_def = next((p for p in schema.get('attributes') if p.get('id') == i), None)
+                prop_def = schema.get(i)
                 if prop_def is None:
                     continue
                 print(f'  {prop_def.get('name')} ({i})')
                 value_map = {}
 
                 if (prop_def.get('dataType') == DATA_TYPE_STRING):
-                    for key, value in prop_def.get('allowedValues').get('map').items():
-                        value_map[value] = key
+                    value_map = schema.get_allowed_values(i)
                 values = stream_data.get(i)
                 for v in values:
                     value = values[v]
@@ -11,13 +11,12 @@ from common.auth import create_token
 from common.tandemClient import TandemClient
 from common.constants import (
     DATA_TYPE_STRING,
-    QC_ELEMENT_FLAGS,
     QC_KEY,
     QC_NAME,
     QC_ONAME
 )
-from common.encoding import to_full_key
-from common.utils import get_default_model, is_logical_element
+from common.keyIndex import KeyIndex
+from common.utils import get_default_model
 
 # update values below according to your environment
 APS_CLIENT_ID = 'YOUR_CLIENT_ID'
@@ -37,15 +36,17 @@ def main():
             raise Exception('Default model not found')
         default_model_id = default_model.get('modelId')
         # STEP 3 - get schema
-        schema = client.get_model_schema(default_model_id)
+        schema = client.get_model_schema(default_model_id, as_index=True)
         # STEP 4 - get streams
         streams = client.get_streams(default_model_id)
+        # build index of streams - it allows to find stream by short, full or xref key
+        stream_index = KeyIndex(default_model_id, streams)
         # STEP 5 - get last readings for each stream
         keys = [stream.get(QC_KEY) for stream in streams]
         data = client.get_stream_last_reading(default_model_id, keys)
         for key in data:
-            # STEP 6 - read stream name
-            stream = next((s for s in streams if to_full_key(s.get(QC_KEY), is_logical_element(s.get(QC_ELEMENT_FLAGS))) == key), None)
+            # STEP 6 - read stream name. Response uses full keys.
+            stream = stream_index.get(key)
             if stream is None:
                 continue
             name = stream.get(QC_ONAME, None) or stream.get(QC_NAME, None)
@@ -54,18 +55,17 @@ def main():
             item = data.get(key)
 
             for prop_id in item:
-                prop_def = next((p for p in schema.get('attributes') if p.get('id') == prop_id), None)
+                prop_def = schema.get(prop_id)
                 if prop_def is None:
                     continue
                 print(f'  {prop_def.get('name')} ({prop_id})')
                 # STEP 8 - create map in case of discrete values. In this case the map of allowed strings
                 # is stored in the property definition. The map is string to number. The stream data contains integer
-                # values which needs to be mapped to strings. We create map for this purpose.
+                # values which needs to be mapped to strings. Schema index provides reverse map for this purpose.
                 value_map = {}
 
                 if (prop_def.get('dataType') == DATA_TYPE_STRING):
-                    for key, value in prop_def.get('allowedValues').get('map').items():
-                        value_map[value] = key
+                    value_map = schema.get_allowed_values(prop_id)
                 values = item.get(prop_id)
                 for ts in values:
                     date = localtime(int(ts) * 0.001)
@@ -0,0 +1,70 @@
+"""
+This example demonstrates how to calculate rollups (i.e. 15 minute averages) of stream data over long
+time range. Data is fetched by time windows and aggregated as it arrives so raw values are not kept
+in memory.
+
+It uses 2-legged authentication - this requires that application is added to facility as service.
+"""
+
+from time import localtime, strftime, time
+
+from common.auth import create_token
+from common.tandemClient import TandemClient
+from common.constants import (
+    QC_ELEMENT_FLAGS,
+    QC_KEY,
+    QC_NAME,
+    QC_ONAME
+)
+from common.encoding import to_full_key
+from common.resampler import resample_chunks
+from common.streamFetcher import StreamDataFetcher
+from common.utils import get_default_model, is_logical_element
+
+# update values below according to your environment
+APS_CLIENT_ID = 'YOUR_CLIENT_ID'
+APS_CLIENT_SECRET = 'YOUR_CLIENT_SECRET'
+FACILITY_URN = 'YOUR_FACILITY_URN'
+OFFSET_DAYS = 365
+# width of rollup in milliseconds
+ROLLUP_WIDTH = 15 * 60 * 1000
+ROLLUP_AGGREGATIONS = ['mean', 'min', 'max', 'count', 'p95']
+
+def main():
+    # Start
+    # STEP 1 - obtain token. The sample uses 2-legged token but it would also work
+    # with 3-legged token assuming that user has access to the facility
+    token = create_token(APS_CLIENT_ID, APS_CLIENT_SECRET, ['data:read'])
+    with TandemClient(lambda: token) as client:
+        # STEP 2 - get facility and default model. The default model has same id as facility
+        facility = client.get_facility(FACILITY_URN)
+        default_model = get_default_model(FACILITY_URN, facility)
+        if default_model is None:
+            raise Exception('Default model not found')
+        default_model_id = default_model.get('modelId')
+        # STEP 3 - get schema and streams
+        schema = client.get_model_schema(default_model_id, as_index=True)
+        streams = client.get_streams(default_model_id)
+        stream_names = {}
+
+        for stream in streams:
+            key = to_full_key(stream.get(QC_KEY), is_logical_element(stream.get(QC_ELEMENT_FLAGS)))
+            stream_names[key] = stream.get(QC_ONAME) or stream.get(QC_NAME)
+        # STEP 4 - calculate dates (from, to)
+        to_date = round(time() * 1000)
+        from_date = to_date - OFFSET_DAYS * 24 * 60 * 60 * 1000
+        # STEP 5 - fetch stream data by windows and aggregate completed rollups as chunks arrive
+        fetcher = StreamDataFetcher(client)
+        chunks = fetcher.fetch(default_model_id, list(stream_names.keys()), from_date, to_date)
+        for key, prop_id, buckets, results in resample_chunks(chunks, ROLLUP_WIDTH, ROLLUP_AGGREGATIONS):
+            prop_def = schema.get(prop_id)
+            prop_name = prop_def.get('name') if prop_def is not None else prop_id
+            print(f'{stream_names.get(key)} - {prop_name}')
+            for i in range(len(buckets)):
+                date = strftime('%Y-%m-%d %H:%M', localtime(int(buckets[i]) * 0.001))
+                values = ', '.join(f'{a}: {results[a][i]:g}' for a in ROLLUP_AGGREGATIONS)
+                print(f'  [{date}] {values}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+This example demonstrates how to monitor streams for new values. Last timestamp seen for each stream is
+stored in local file so only new values are requested - also when the script is restarted.
+
+It uses 2-legged authentication - this requires that application is added to facility as service.
+"""
+
+from time import localtime, strftime
+from typing import List
+
+from common.auth import TokenProvider
+from common.tandemClient import TandemClient
+from common.constants import (
+    QC_ELEMENT_FLAGS,
+    QC_KEY,
+    QC_NAME,
+    QC_ONAME
+)
+from common.encoding import to_full_key
+from common.streamPoller import StreamPoller, StreamReading
+from common.utils import get_default_model, is_logical_element
+
+# update values below according to your environment
+APS_CLIENT_ID = 'YOUR_CLIENT_ID'
+APS_CLIENT_SECRET = 'YOUR_CLIENT_SECRET'
+FACILITY_URN = 'YOUR_FACILITY_URN'
+# file used to store last timestamp of each stream
+STATE_FILE = 'stream-poller-state.json'
+# time between polls in seconds
+POLL_INTERVAL = 60
+
+def main():
+    # Start
+    # STEP 1 - create token provider. Token is refreshed before it expires because script runs for long time.
+    token_provider = TokenProvider(APS_CLIENT_ID, APS_CLIENT_SECRET, ['data:read'])
+    with TandemClient(token_provider) as client:
+        # STEP 2 - get facility and default model. The default model has same id as facility
+        facility = client.get_facility(FACILITY_URN)
+        default_model = get_default_model(FACILITY_URN, facility)
+        if default_model is None:
+            raise Exception('Default model not found')
+        default_model_id = default_model.get('modelId')
+        # STEP 3 - get schema and streams
+        schema = client.get_model_schema(default_model_id, as_index=True)
+        streams = client.get_streams(default_model_id)
+        stream_names = {}
+
+        for stream in streams:
+            key = to_full_key(stream.get(QC_KEY), is_logical_element(stream.get(QC_ELEMENT_FLAGS)))
+            stream_names[key] = stream.get(QC_ONAME) or stream.get(QC_NAME)
+        # STEP 4 - print new values as they arrive. Use Ctrl+C to stop.
+        def on_readings(readings: List[StreamReading]) -> None:
+            for reading in readings:
+                prop_def = schema.get(reading.attr)
+                prop_name = prop_def.get('name') if prop_def is not None else reading.attr
+                date = strftime('%Y-%m-%d %H:%M:%S', localtime(reading.timestamp * 0.001))
+                print(f'[{date}] {stream_names.get(reading.key)} - {prop_name}: {reading.value}')
+
+        poller = StreamPoller(client, default_model_id, list(stream_names.keys()), STATE_FILE, interval=POLL_INTERVAL)
+        poller.run(on_readings)
+
+
+if __name__ == '__main__':
+    main()
@@ -18,7 +18,7 @@ from common.constants import (
     QC_SETTINGS
 )
 from common.encoding import (
-    decode_text_to_object,
+    decode_text_to_object_cached,
     to_full_key,
     to_system_id
 )
@@ -87,7 +87,8 @@ def get_subsystem_parameters(encoded_settings: str, facility_template: Any) -> l
     parameters = []
 
     try:
-        config = decode_text_to_object(encoded_settings)
+        # subsystems often share same settings - decoded settings are cached
+        config = decode_text_to_object_cached(encoded_settings)
 
         for key, value in config.items():
             match = re.match(r'^\[(.+?)\]\[(.+?)\]$', key)
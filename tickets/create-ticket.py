@@ -33,6 +33,7 @@ from common.constants import (
     QC_OXROOMS,
     TC_TICKET
 )
+from common.facilityScanner import FacilityScanner
 from common.encoding import decode_xref_key, to_full_key, to_xref_key
 from common.utils import get_default_model, is_logical_element
 
@@ -57,25 +58,20 @@ def main():
         default_model = get_default_model(FACILITY_URN, facility)
         if default_model is None:
             raise Exception('Unable to find default model')
-        # STEP 3 - find asset by name. In case when there is multiple assets with same name the first one is selected.
+        # STEP 3 - find asset by name. Models are scanned in parallel and only columns needed to check name
+        # are requested. In case when there is multiple assets with same name the first one found is selected.
         xref = None
-
-        for link in facility.get('links', []):
-            model_id = link.get('modelId')
-            elements = client.get_elements(model_id)
-
-            for element in elements:
-                name = element.get(QC_ONAME) or element.get(QC_NAME)
-
-                if name == ASSET_NAME:
-                    element_flags = element.get(QC_ELEMENT_FLAGS)
-                    key = element.get(QC_KEY)
-                    # create xref key of an asset
-                    xref = to_xref_key(model_id, to_full_key(key, is_logical_element(element_flags)))
-                    break
-            # element found - exit loop
-            if xref is not None:
-                break
+        scanner = FacilityScanner(client)
+        results = scanner.find_elements(facility,
+                                        lambda e: (e.get(QC_ONAME) or e.get(QC_NAME)) == ASSET_NAME,
+                                        columns=[QC_NAME, QC_ONAME, QC_ELEMENT_FLAGS],
+                                        limit=1)
+        if len(results) > 0:
+            model_id, element = results[0]
+            element_flags = element.get(QC_ELEMENT_FLAGS)
+            key = element.get(QC_KEY)
+            # create xref key of an asset
+            xref = to_xref_key(model_id, to_full_key(key, is_logical_element(element_flags)))
         if xref is None:
             raise Exception(f'Unable to find asset with name: {ASSET_NAME}')
         # STEP 4 - get rooms and levels from parent asset